@@ -0,0 +1,70 @@
+"""Micro-benchmark for load_config caching on a config with thousands of rules.
+
+Compares a cold parse, an in-process memo hit, and a fresh-process load from
+the on-disk snapshot (simulated by clearing the memo).
+
+    python benchmarks/bench_config.py --rules 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import dotruler.config as config_module
+from dotruler.config import load_config
+
+
+def write_config(path: Path, rules: int) -> None:
+    rule_lines = "\n".join(f'  "Rule {i}: prefer small, pure functions in module {i % 97}",' for i in range(rules))
+    note_lines = "\n".join(f'  "Module {i} lives in src/mod{i}/",' for i in range(rules // 10))
+    path.write_text(
+        f'[project]\nname = "bench"\nlanguages = ["python", "typescript"]\n\n'
+        f"[style]\nrules = [\n{rule_lines}\n]\n\n"
+        f"[architecture]\nnotes = [\n{note_lines}\n]\n\n"
+        '[targets]\nenabled = ["claude-md", "cursorrules", "copilot"]\n'
+    )
+    # Old enough that the memo and snapshot trust it.
+    os.utime(path, ns=(1_600_000_000_000_000_000,) * 2)
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<16} {elapsed * 1e6:10.1f} µs")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / ".dotruler.toml"
+        write_config(path, args.rules)
+        print(f"{args.rules} rules, {path.stat().st_size:,} bytes\n")
+
+        cold = bench("cold parse", lambda: load_config(path, use_cache=False), args.repeat)
+        load_config(path)
+        bench("memo hit", lambda: load_config(path), args.repeat)
+
+        load_config(path, persist=True)
+
+        def from_snapshot():
+            config_module._CONFIG_MEMO.clear()
+            config_module._MERGED_MEMO.clear()
+            load_config(path, persist=True)
+
+        snap = bench("disk snapshot", from_snapshot, args.repeat)
+        print(f"\nsnapshot speedup over cold parse: {cold / snap:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
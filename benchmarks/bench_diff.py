@@ -0,0 +1,92 @@
+"""Benchmark ``dotruler diff`` output for a 10k-line generated file with a few edits.
+
+"difflib" is the old path: ``difflib.unified_diff`` over the whole file and
+one rich ``console.print`` with markup per line. "sections" diffs only the
+sections that changed and prints the result as one batched ``Text``.
+"--stat" counts changed lines without printing the diff.
+
+    python benchmarks/bench_diff.py --lines 10000 --edits 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import random
+import time
+
+from rich.console import Console
+from rich.text import Text
+
+from dotruler.diff import diff_stat, unified_diff
+
+
+def make_lines(lines: int) -> list[str]:
+    out = ["# Project"]
+    section = 0
+    while len(out) < lines:
+        out += ["", f"## Section {section}", ""] + [f"- Rule {section}.{i}: keep things consistent" for i in range(40)]
+        section += 1
+    return out[:lines]
+
+
+def edit(lines: list[str], edits: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    out = list(lines)
+    for n in range(edits):
+        i = rng.randrange(len(out))
+        if out[i].startswith("- "):
+            out[i] += f" (edited {n})"
+        else:
+            out.insert(i, f"- Inserted rule {n}")
+    return out
+
+
+def old(console: Console, a: list[str], b: list[str]) -> None:
+    for line in difflib.unified_diff(a, b, "CLAUDE.md", "CLAUDE.md", lineterm=""):
+        if line.startswith("+") and not line.startswith("+++"):
+            console.print(f"    [green]{line}[/green]")
+        elif line.startswith("-") and not line.startswith("---"):
+            console.print(f"    [red]{line}[/red]")
+        else:
+            console.print(f"    {line}")
+
+
+def new(console: Console, a: list[str], b: list[str]) -> None:
+    text = Text()
+    for line in unified_diff(a, b, "CLAUDE.md", "CLAUDE.md"):
+        text.append(f"    {line}", {"+": "green", "-": "red"}.get(line[:1]))
+        text.append("\n")
+    console.print(text, end="", soft_wrap=True)
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<9} {elapsed * 1000:9.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    a = make_lines(args.lines)
+    b = edit(a, args.edits)
+    with open(os.devnull, "w") as devnull:
+        console = Console(file=devnull, force_terminal=True, width=120)
+        base = bench("difflib", lambda: old(console, a, b), args.repeat)
+        fast = bench("sections", lambda: new(console, a, b), args.repeat)
+        bench("--stat", lambda: diff_stat(a, b), args.repeat)
+        bench("equal", lambda: list(unified_diff(a, list(a))), args.repeat)
+    print(f"speedup   {base / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
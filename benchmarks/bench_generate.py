@@ -0,0 +1,65 @@
+"""Benchmark generating every target on a slow (network) filesystem.
+
+Latency is simulated by sleeping in each ``stat``/read and in each rename of
+a generated file, roughly what an NFS round trip costs. Compares writing
+targets one at a time (``--workers 1``) with writing them concurrently.
+
+    python benchmarks/bench_generate.py --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_render import make_config
+
+import dotruler.fileio as fileio
+from dotruler.cli import _generate_targets
+
+
+def slow_io(latency: float) -> None:
+    is_unchanged, replace = fileio.is_unchanged, fileio._replace
+
+    def slow_is_unchanged(path, data):
+        time.sleep(latency)
+        return is_unchanged(path, data)
+
+    def slow_replace(tmp, path):
+        time.sleep(latency)
+        replace(tmp, path)
+
+    fileio.is_unchanged = slow_is_unchanged
+    fileio._replace = slow_replace
+
+
+def bench(label: str, config, workers: int | None, repeat: int) -> float:
+    total = 0.0
+    for i in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            _generate_targets(config, Path(tmp), dry_run=False, workers=workers)
+            total += time.perf_counter() - start
+    elapsed = total / repeat
+    print(f"{label:<12} {elapsed * 1000:8.1f} ms per generate ({len(config.targets.enabled)} targets)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--rules", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    config = make_config(args.rules, notes=50)
+    slow_io(args.latency_ms / 1000)
+    before = bench("sequential", config, 1, args.repeat)
+    after = bench("concurrent", config, None, args.repeat)
+    print(f"speedup      {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark memory held by many configs in a batch or watch process.
+
+"mutable" mirrors the plain ``@dataclass`` models with list fields and a
+per-instance ``__dict__``; "frozen" uses the slotted, tuple-backed models
+from ``dotruler.models``. Strings are shared between both so only container
+overhead is measured.
+
+    python benchmarks/bench_models.py --configs 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+
+from dotruler.config import _parse_config
+
+
+@dataclass
+class _Project:
+    name: str = ""
+    description: str = ""
+    languages: list[str] = field(default_factory=list)
+    frameworks: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Rules:
+    rules: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Commands:
+    build: str = ""
+    test: str = ""
+    lint: str = ""
+    dev: str = ""
+
+
+@dataclass
+class _Override:
+    extra_rules: list[str] = field(default_factory=list)
+    output_path: str = ""
+
+
+@dataclass
+class _Targets:
+    enabled: list[str] = field(default_factory=list)
+    overrides: dict[str, _Override] = field(default_factory=dict)
+
+
+@dataclass
+class _Config:
+    project: _Project
+    style: _Rules
+    commands: _Commands
+    architecture: _Rules
+    targets: _Targets
+
+
+RULES = [f"Rule {i}" for i in range(8)]
+NOTES = [f"Note {i}" for i in range(4)]
+
+
+def make_raw(i: int) -> dict:
+    return {
+        "project": {"name": f"pkg{i}", "languages": ["python", "typescript"], "frameworks": ["fastapi"]},
+        "style": {"rules": RULES},
+        "commands": {"build": "make", "test": "pytest", "lint": "ruff check ."},
+        "architecture": {"notes": NOTES},
+        "targets": {"enabled": ["claude-md", "cursorrules", "copilot"], "claude-md": {"extra_rules": ["Read first"]}},
+    }
+
+
+def mutable(raw: dict) -> _Config:
+    targets = dict(raw["targets"])
+    enabled = targets.pop("enabled")
+    return _Config(
+        project=_Project(**{k: list(v) if isinstance(v, list) else v for k, v in raw["project"].items()}),
+        style=_Rules(list(raw["style"]["rules"])),
+        commands=_Commands(**raw["commands"]),
+        architecture=_Rules(list(raw["architecture"]["notes"])),
+        targets=_Targets(list(enabled), {k: _Override(list(v["extra_rules"])) for k, v in targets.items()}),
+    )
+
+
+def measure(label: str, build, raws: list[dict]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    configs = [build(raw) for raw in raws]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<8} {size / 1024:10,.0f} KiB  ({size / len(configs):,.0f} bytes per config)")
+    del configs
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", type=int, default=10000)
+    args = parser.parse_args()
+
+    raws = [make_raw(i) for i in range(args.configs)]
+    before = measure("mutable", mutable, raws)
+    after = measure("frozen", _parse_config, raws)
+    print(f"saving   {1 - after / before:10.0%}")
+
+
+if __name__ == "__main__":
+    main()
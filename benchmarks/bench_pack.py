@@ -0,0 +1,56 @@
+"""Benchmark packing a huge config into the size-limited targets.
+
+"truncate" is the old behaviour (render, then cut at the limit); "pack"
+drops whole rules and notes by priority until the output fits.
+
+    python benchmarks/bench_pack.py --rules 20000 --notes 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from bench_render import make_config
+
+from dotruler.outputs.document import Document
+from dotruler.outputs.packing import pack, truncate
+from dotruler.registry import get_renderer
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"  {label:<9} {elapsed * 1000:8.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=20000)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    document = Document.from_config(make_config(args.rules, args.notes))
+    for target_id in ("windsurf", "codex"):
+        renderer = get_renderer(target_id)()
+        print(f"{target_id} ({renderer.max_chars:,} {renderer.limit_unit})")
+        bench(
+            "truncate",
+            lambda: truncate(renderer.render_document(document), renderer.max_chars, renderer.limit_unit),
+            args.repeat,
+        )
+
+        def packed() -> None:
+            doc, _ = pack(renderer, document, renderer.max_chars, renderer.limit_unit)
+            renderer.render_document(doc)
+
+        bench("pack", packed, args.repeat)
+        print(f"  {pack(renderer, document, renderer.max_chars, renderer.limit_unit)[1].summary()}")
+
+
+if __name__ == "__main__":
+    main()
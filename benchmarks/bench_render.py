@@ -0,0 +1,82 @@
+"""Benchmark rendering every target for a large config.
+
+"per-target" builds the shared fragments inside every renderer, as each
+renderer did before the document model; "shared" builds one ``Document`` per
+config and hands it to all renderers.
+
+    python benchmarks/bench_render.py --rules 5000 --notes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import dotruler.outputs  # noqa: F401
+from dotruler.models import (
+    AiRulesConfig,
+    ArchitectureConfig,
+    CommandsConfig,
+    ProjectConfig,
+    StyleConfig,
+    TargetOverride,
+    TargetsConfig,
+)
+from dotruler.outputs.document import Document
+from dotruler.registry import list_targets
+
+
+def make_config(rules: int, notes: int) -> AiRulesConfig:
+    return AiRulesConfig(
+        project=ProjectConfig(
+            name="bench",
+            description="Synthetic large config",
+            languages=["python", "typescript", "go"],
+            frameworks=["fastapi", "nextjs"],
+        ),
+        style=StyleConfig(rules=[f"Rule {i}: keep functions under {i % 50 + 10} lines" for i in range(rules)]),
+        commands=CommandsConfig(build="make build", test="pytest", lint="ruff check .", dev="make dev"),
+        architecture=ArchitectureConfig(notes=[f"Module {i} lives in src/mod{i}/" for i in range(notes)]),
+        targets=TargetsConfig(
+            enabled=sorted(list_targets()),
+            overrides={"claude-md": TargetOverride(extra_rules=["Use Read tool first"])},
+        ),
+    )
+
+
+def per_target(config: AiRulesConfig, renderers) -> None:
+    for renderer in renderers:
+        renderer.render(config)
+
+
+def shared(config: AiRulesConfig, renderers) -> None:
+    document = Document.from_config(config)
+    for renderer in renderers:
+        renderer.render_document(document)
+
+
+def bench(label: str, fn, config, renderers, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(config, renderers)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<12} {elapsed * 1000:8.2f} ms per config ({len(renderers)} targets)")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    config = make_config(args.rules, args.notes)
+    renderers = [cls() for _, cls in sorted(list_targets().items())]
+    before = bench("per-target", per_target, config, renderers, args.repeat)
+    after = bench("shared", shared, config, renderers, args.repeat)
+    print(f"speedup      {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
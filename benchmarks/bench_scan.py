@@ -0,0 +1,180 @@
+"""Benchmark the scanner walk on a large synthetic tree.
+
+Compares the original recursive ``Path.iterdir`` walker against
+``dotruler.scanner.scan_languages`` with no cache, a cold cache, a warm
+cache, a 0.2s time budget, and a root ``.gitignore`` that excludes half of the
+tree. Reports wall time and the number of stat calls (``os.stat`` and
+``DirEntry.stat``, which the scanner uses for source file sizes) and
+directory listings made from Python. ``DirEntry`` type checks are served from
+the directory listing and aren't stat calls. Counting ``DirEntry.stat`` goes
+through a proxy, so calls are counted in a separate, untimed pass.
+
+    python benchmarks/bench_scan.py --files 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from dotruler.scanner import LANGUAGE_MAP, SCAN_CACHE_NAME, SKIP_DIRS, scan_languages
+from dotruler.state import cache_file
+
+EXTENSIONS = [".py", ".ts", ".tsx", ".go", ".rs", ".md", ".json", ".txt"]
+
+
+def build_tree(root: Path, files: int, fanout: int = 20, per_dir: int = 50) -> int:
+    """Create a tree of empty files, ``per_dir`` files per directory."""
+    created = 0
+    queue = [root]
+    while created < files:
+        directory = queue.pop(0)
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(min(per_dir, files - created)):
+            (directory / f"f{i}{EXTENSIONS[i % len(EXTENSIONS)]}").touch()
+            created += 1
+        queue.extend(directory / f"d{i}" for i in range(fanout))
+    # A skipped directory the walker must prune without listing.
+    (root / "node_modules" / "pkg").mkdir(parents=True, exist_ok=True)
+    (root / "node_modules" / "pkg" / "index.js").touch()
+    return created
+
+
+def legacy_walk(directory: Path, max_depth: int, _depth: int = 0):
+    """The pre-scandir walker, kept here as the baseline."""
+    if _depth > max_depth:
+        return
+    try:
+        for item in directory.iterdir():
+            if item.is_file():
+                yield item
+            elif item.is_dir() and item.name not in SKIP_DIRS:
+                yield from legacy_walk(item, max_depth, _depth + 1)
+    except PermissionError:
+        pass
+
+
+class _CountingEntry:
+    """``DirEntry`` proxy counting ``stat()`` calls (``DirEntry`` itself can't be patched)."""
+
+    __slots__ = ("_entry", "_counts")
+
+    def __init__(self, entry, counts) -> None:
+        self._entry = entry
+        self._counts = counts
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, **kwargs):
+        self._counts["stat"] += 1
+        return self._entry.stat(**kwargs)
+
+
+class _CountingScandir:
+    def __init__(self, it, counts) -> None:
+        self._it = it
+        self._counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._it.close()
+
+    def __iter__(self):
+        return (_CountingEntry(entry, self._counts) for entry in self._it)
+
+
+@contextmanager
+def count_calls():
+    """Count ``os.stat``, ``DirEntry.stat`` and directory listing calls made from Python."""
+    counts = {"stat": 0, "listdir": 0}
+    real_stat, real_scandir, real_listdir = os.stat, os.scandir, os.listdir
+
+    def stat(*args, **kwargs):
+        counts["stat"] += 1
+        return real_stat(*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        counts["listdir"] += 1
+        return _CountingScandir(real_scandir(*args, **kwargs), counts)
+
+    def listdir(*args, **kwargs):
+        counts["listdir"] += 1
+        return real_listdir(*args, **kwargs)
+
+    os.stat, os.scandir, os.listdir = stat, scandir, listdir
+    try:
+        yield counts
+    finally:
+        os.stat, os.scandir, os.listdir = real_stat, real_scandir, real_listdir
+
+
+def legacy_scan(root: Path, max_depth: int) -> list[str]:
+    found: set[str] = set()
+    for item in legacy_walk(root, max_depth):
+        lang = LANGUAGE_MAP.get(item.suffix.lower())
+        if lang:
+            found.add(lang)
+    return sorted(found)
+
+
+def run(label: str, scan, reset=None) -> None:
+    """Time ``scan``, then count its calls in a second, instrumented pass.
+
+    ``reset`` runs before each pass, so both start from the same state.
+    """
+    if reset:
+        reset()
+    start = time.perf_counter()
+    found = scan()
+    elapsed = time.perf_counter() - start
+    if reset:
+        reset()
+    with count_calls() as counts:
+        scan()
+    print(
+        f"{label:<12} {elapsed:8.3f}s  stat={counts['stat']:<9} "
+        f"listings={counts['listdir']:<7} langs={len(found)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--root", type=Path, help="Reuse an existing tree instead of building one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root or Path(tmp)
+        if not args.root:
+            start = time.perf_counter()
+            created = build_tree(root, args.files)
+            print(f"built {created:,} files in {time.perf_counter() - start:.1f}s\n")
+        depth = args.max_depth
+        run("iterdir", lambda: legacy_scan(root, depth))
+        run("scandir", lambda: scan_languages(root, depth))
+        # Directories modified within the last 2s are never trusted from cache.
+        time.sleep(2.1)
+        cache = cache_file(root, SCAN_CACHE_NAME)
+        run(
+            "cache cold",
+            lambda: scan_languages(root, depth, use_cache=True),
+            reset=lambda: cache.unlink(missing_ok=True),
+        )
+        run("cache warm", lambda: scan_languages(root, depth, use_cache=True))
+        run("budget 0.2s", lambda: scan_languages(root, depth, time_budget=0.2))
+        # Half of the top-level directories ignored, as generated output often is.
+        (root / ".gitignore").write_text("/d[0-4]/\n*.log\n")
+        run("gitignore", lambda: scan_languages(root, depth))
+        (root / ".gitignore").unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Track CLI startup cost with ``python -X importtime``.
+
+Reports the cumulative import time of ``dotruler.cli``, the heaviest imports
+it pulls in, which optional heavy modules (rich, the renderers) get loaded,
+and the wall time of a few short commands run as fresh processes.
+
+    python benchmarks/bench_startup.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+WATCHED = ("rich.console", "rich.table", "dotruler.outputs", "dotruler.outputs.claude_md")
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Return cumulative import time in microseconds per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def command_time(args: list[str], repeat: int, env: dict[str, str]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "dotruler.cli", *args],
+            capture_output=True,
+            check=False,
+            env=env,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    times = import_times("import dotruler.cli")
+    print(f"import dotruler.cli: {times['dotruler.cli'] / 1000:.1f} ms cumulative\n")
+    print("heaviest imports:")
+    for name, micros in sorted(times.items(), key=lambda kv: -kv[1])[1 : args.top + 1]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    loaded = [m for m in WATCHED if m in times]
+    print(f"\nheavy modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    print("\nfresh-process wall time (best of", args.repeat, "runs):")
+    env = dict(os.environ)
+    plain = {**env, "DOTRULER_PLAIN": "1"}
+    for label, argv, run_env in [
+        ("version", ["version"], env),
+        ("version --plain", ["version"], plain),
+        ("list", ["list"], env),
+        ("list --plain", ["list"], plain),
+    ]:
+        print(f"  {command_time(argv, args.repeat, run_env) * 1000:8.1f} ms  {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark peak memory of writing a very large target, buffered vs streamed.
+
+"buffered" builds the whole output string and its UTF-8 bytes before
+writing; "streamed" writes section by section to a temp file. The shared
+``Document`` is built up front so only the write path is measured.
+
+    python benchmarks/bench_stream.py --rules 20000 --notes 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench_render import make_config
+
+from dotruler.outputs.cache import render_cache
+from dotruler.outputs.document import Document
+from dotruler.registry import get_renderer
+
+
+def measure(label: str, renderer, config, document, stream: bool, out_dir: Path) -> int:
+    render_cache.clear()
+    (out_dir / renderer.default_output_path).unlink(missing_ok=True)
+    tracemalloc.start()
+    start = time.perf_counter()
+    renderer.write_if_changed(config, out_dir, document, stream=stream)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<9} peak {peak / 1024:10,.0f} KiB  {elapsed * 1000:8.1f} ms")
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=20000)
+    parser.add_argument("--notes", type=int, default=20000)
+    parser.add_argument("--target", default="claude-md")
+    args = parser.parse_args()
+
+    config = make_config(args.rules, args.notes)
+    document = Document.from_config(config)
+    renderer = get_renderer(args.target)()
+    with tempfile.TemporaryDirectory() as tmp:
+        before = measure("buffered", renderer, config, document, False, Path(tmp))
+        after = measure("streamed", renderer, config, document, True, Path(tmp))
+    print(f"peak reduced {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
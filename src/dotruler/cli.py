@@ -2,19 +2,127 @@
 
 from __future__ import annotations
 
+import re
+import time
 from pathlib import Path
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+
+import dotruler.state
 
 app = typer.Typer(
     name="dotruler",
     help="One config. Every AI coding tool. Always in sync.",
     no_args_is_help=True,
 )
-console = Console()
+
+_MARKUP_RE = re.compile(r"\[/?(?:bold|dim|red|green|yellow|cyan)(?: (?:bold|dim|red|green|yellow|cyan))*\]")
+
+
+class _Output:
+    """Console that imports rich only when something is printed.
+
+    In plain mode rich is never imported: markup is stripped and tables are
+    printed as tab-separated rows, which is also easier for machines to parse.
+    """
+
+    def __init__(self) -> None:
+        self.plain = False
+        self._console = None
+
+    @property
+    def rich(self):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    def print(self, *objects) -> None:
+        if self.plain:
+            typer.echo(" ".join(_MARKUP_RE.sub("", str(o)) for o in objects))
+        else:
+            self.rich.print(*objects)
+
+    def lines(self, lines: list[tuple[str, str]]) -> None:
+        """Print ``(style, text)`` lines in one write. Text is printed literally, never as markup."""
+        if self.plain:
+            typer.echo("\n".join(text for _, text in lines))
+            return
+
+        from rich.text import Text
+
+        text = Text()
+        for style, line in lines:
+            text.append(line, style or None)
+            text.append("\n")
+        self.rich.print(text, end="", soft_wrap=True)
+
+    def table(self, columns: list[tuple[str, dict]], rows: list[tuple[str, ...]], **kwargs) -> None:
+        """Print a table. ``columns`` are (header, rich column options) pairs."""
+        if self.plain:
+            for row in [tuple(header for header, _ in columns), *rows]:
+                typer.echo("\t".join(_MARKUP_RE.sub("", cell) for cell in row))
+            return
+
+        from rich.table import Table
+
+        table = Table(show_header=True, **kwargs)
+        for header, options in columns:
+            table.add_column(header, **options)
+        for row in rows:
+            table.add_row(*row)
+        self.rich.print(table)
+
+    def panel(self, text: str, **kwargs) -> None:
+        if self.plain:
+            self.print(text)
+            return
+
+        from rich.panel import Panel
+
+        self.rich.print(Panel(text, **kwargs))
+
+
+console = _Output()
+
+
+@app.callback()
+def _main(
+    ctx: typer.Context,
+    plain: bool = typer.Option(
+        False, "--plain", envvar="DOTRULER_PLAIN", help="Plain text output, no colors or tables"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", envvar="DOTRULER_NO_CACHE", help="Don't read or write caches in .dotruler/"
+    ),
+    cache_stats: bool = typer.Option(
+        False, "--cache-stats", help="Print render cache hits and misses when done"
+    ),
+    tokenizer: str = typer.Option(
+        "heuristic", "--tokenizer", envvar="DOTRULER_TOKENIZER", help="Token estimator: heuristic or tiktoken"
+    ),
+):
+    from dotruler.tokens import set_tokenizer
+
+    console.plain = plain
+    dotruler.state.enabled = not no_cache
+    try:
+        set_tokenizer(tokenizer)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    if cache_stats:
+        from dotruler.outputs.cache import render_cache
+
+        render_cache.hits = render_cache.misses = 0
+        ctx.call_on_close(_print_cache_stats)
+
+
+def _print_cache_stats() -> None:
+    from dotruler.outputs.cache import render_cache
+
+    console.print(f"[dim]render cache: {render_cache.hits} hits, {render_cache.misses} misses[/dim]")
 
 
 def _load_or_exit(config_path: Path | None = None):
@@ -28,46 +136,16 @@ def _load_or_exit(config_path: Path | None = None):
         )
         raise typer.Exit(1)
 
-    config = load_config(path)
-    return config, path
-
-
-@app.command()
-def init(
-    directory: Path = typer.Argument(Path("."), help="Project directory to scan"),
-    force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing config"),
-):
-    """Scan your project and generate a starter .dotruler.toml."""
-    from dotruler.config import CONFIG_FILENAME
-    from dotruler.scanner import scan_project
-
-    project_dir = directory.resolve()
-    config_path = project_dir / CONFIG_FILENAME
-
-    if config_path.exists() and not force:
-        console.print(
-            f"[yellow]{CONFIG_FILENAME} already exists.[/yellow] Use --force to overwrite."
-        )
+    try:
+        config = load_config(path, persist=True)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Could not load {path}:[/red] {e}")
         raise typer.Exit(1)
+    return config, path
 
-    console.print(f"[bold]Scanning[/bold] {project_dir}...\n")
-    scan = scan_project(project_dir)
-
-    # Show what was detected
-    if scan["languages"]:
-        console.print(f"  Languages:  {', '.join(scan['languages'])}")
-    if scan["frameworks"]:
-        console.print(f"  Frameworks: {', '.join(scan['frameworks'])}")
-    if scan["commands"]:
-        console.print(f"  Commands:   {', '.join(scan['commands'].keys())}")
-    if scan["existing_ai_configs"]:
-        console.print(
-            f"  AI configs: {', '.join(scan['existing_ai_configs'].keys())} (found existing)"
-        )
-    console.print()
 
-    # Generate TOML
-    name = project_dir.name
+def _build_init_toml(name: str, scan: dict) -> str:
+    """Render a starter .dotruler.toml from scan results."""
     toml_lines = [
         f'[project]',
         f'name = "{name}"',
@@ -114,31 +192,363 @@ def init(
     toml_lines.append("[targets]")
     toml_lines.append('enabled = ["claude-md", "cursorrules", "copilot"]')
 
-    content = "\n".join(toml_lines) + "\n"
-    config_path.write_text(content, encoding="utf-8")
+    return "\n".join(toml_lines) + "\n"
+
+
+def _init_project(
+    project_dir: Path, force: bool, use_cache: bool, time_budget: float | None = None
+) -> tuple[str, dict | None, float]:
+    """Scan one project and write its config. Returns (status, scan, seconds)."""
+    from dotruler.config import CONFIG_FILENAME
+    from dotruler.scanner import scan_project
+
+    start = time.perf_counter()
+    config_path = project_dir / CONFIG_FILENAME
+    if config_path.exists() and not force:
+        return "exists", None, time.perf_counter() - start
+
+    scan = scan_project(project_dir, use_cache=use_cache, time_budget=time_budget)
+    config_path.write_text(_build_init_toml(project_dir.name, scan), encoding="utf-8")
+    return "created", scan, time.perf_counter() - start
 
+
+def _init_recursive(
+    root: Path, force: bool, workers: int | None, use_cache: bool, time_budget: float | None = None
+) -> None:
+    """Find sub-projects under root and initialize them on a thread pool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dotruler.scanner import find_subprojects
+
+    console.print(f"[bold]Finding projects[/bold] under {root}...\n")
+    projects = find_subprojects(root)
+    if not projects:
+        console.print("[yellow]No projects found.[/yellow] Looked for manifest files like package.json.")
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda p: _init_project(p, force, use_cache, time_budget), projects))
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for project_dir, (status, scan, seconds) in zip(projects, results):
+        rel = project_dir.relative_to(root).as_posix() if project_dir != root else "."
+        label = "[green]created[/green]" if status == "created" else "[dim]exists[/dim]"
+        langs = ", ".join(scan["languages"]) if scan else ""
+        rows.append((rel, label, langs, f"{seconds * 1000:.0f} ms"))
+    console.table(
+        [
+            ("Project", {"style": "bold"}),
+            ("Status", {}),
+            ("Languages", {}),
+            ("Time", {"justify": "right"}),
+        ],
+        rows,
+        box=None,
+    )
+
+    created = sum(1 for status, _, _ in results if status == "created")
     console.print(
-        Panel(
-            f"Created [bold green]{CONFIG_FILENAME}[/bold green]\n\n"
-            "Next steps:\n"
-            f"  1. Edit {CONFIG_FILENAME} — add your coding rules\n"
-            "  2. Run [bold]dotruler generate[/bold] to sync configs",
-            title="[bold]dotruler init[/bold]",
-            border_style="green",
+        f"\n[bold green]Done.[/bold green] {created} of {len(projects)} configs created "
+        f"in {elapsed:.2f}s."
+    )
+    if created < len(projects):
+        console.print("[dim]Use --force to overwrite existing configs.[/dim]")
+
+
+@app.command()
+def init(
+    directory: Path = typer.Argument(Path("."), help="Project directory to scan"),
+    force: bool = typer.Option(False, "--force", "-f", help="Overwrite existing config"),
+    recursive: bool = typer.Option(
+        False, "--recursive", "-r", help="Create a config for every sub-project under directory"
+    ),
+    workers: int = typer.Option(
+        None, "--workers", "-j", min=1, help="Parallel scans for --recursive (default: auto)"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Ignore and don't write the scan cache in .dotruler/"
+    ),
+    scan_budget: float = typer.Option(
+        None, "--scan-budget", min=0, help="Seconds to spend scanning each project (default: 5, 0 = no limit)"
+    ),
+):
+    """Scan your project and generate a starter .dotruler.toml."""
+    from dotruler.config import CONFIG_FILENAME
+    from dotruler.scanner import SCAN_TIME_BUDGET, scan_project
+
+    project_dir = directory.resolve()
+    time_budget = SCAN_TIME_BUDGET if scan_budget is None else scan_budget or None
+    if recursive:
+        _init_recursive(project_dir, force, workers, use_cache=not no_cache, time_budget=time_budget)
+        return
+
+    config_path = project_dir / CONFIG_FILENAME
+
+    if config_path.exists() and not force:
+        console.print(
+            f"[yellow]{CONFIG_FILENAME} already exists.[/yellow] Use --force to overwrite."
         )
+        raise typer.Exit(1)
+
+    console.print(f"[bold]Scanning[/bold] {project_dir}...\n")
+    scan = scan_project(project_dir, use_cache=not no_cache, time_budget=time_budget)
+
+    # Show what was detected
+    if scan["languages"]:
+        stats = scan["language_stats"]
+        counts = []
+        for lang in scan["languages"]:
+            files = stats[lang].files
+            counts.append(f"{lang} [dim]({files:,} file{'s' if files != 1 else ''})[/dim]")
+        langs = ", ".join(counts)
+        console.print(f"  Languages:  {langs}")
+    ignored = sorted(set(scan["language_stats"]) - set(scan["languages"]))
+    if ignored:
+        console.print(f"  [dim]Ignored:    {', '.join(ignored)} (too few files to matter)[/dim]")
+    if not scan["complete"]:
+        console.print(f"  [yellow]Stopped scanning after {time_budget:g}s;[/yellow] deeper directories were skipped")
+    if scan["frameworks"]:
+        console.print(f"  Frameworks: {', '.join(scan['frameworks'])}")
+    if scan["commands"]:
+        console.print(f"  Commands:   {', '.join(scan['commands'].keys())}")
+    if scan["existing_ai_configs"]:
+        console.print(
+            f"  AI configs: {', '.join(scan['existing_ai_configs'].keys())} (found existing)"
+        )
+    console.print()
+
+    # Generate TOML
+    content = _build_init_toml(project_dir.name, scan)
+    config_path.write_text(content, encoding="utf-8")
+
+    console.panel(
+        f"Created [bold green]{CONFIG_FILENAME}[/bold green]\n\n"
+        "Next steps:\n"
+        f"  1. Edit {CONFIG_FILENAME} — add your coding rules\n"
+        "  2. Run [bold]dotruler generate[/bold] to sync configs",
+        title="[bold]dotruler init[/bold]",
+        border_style="green",
     )
 
 
+def _generate_targets(
+    config,
+    project_dir: Path,
+    dry_run: bool,
+    stream: bool = False,
+    workers: int | None = None,
+    config_path: Path | None = None,
+) -> list[tuple[str, str]]:
+    """Render and write every enabled target. Returns (status, detail) per target.
+
+    Targets are rendered and written concurrently (``workers`` threads,
+    default one per target) while holding the project's lock, so concurrent
+    runs against the same checkout don't interleave. Rendering is mostly
+    served from the render cache; the win is overlapping slow filesystem
+    writes. Results keep the order of ``targets.enabled`` and are printed by
+    the caller once all targets are done.
+
+    With ``config_path``, ``.dotruler.lock`` is updated afterwards, and targets
+    the existing lock proves unchanged are not rendered at all.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dotruler.lockfile import DigestCache, output_entry, write_lock
+    from dotruler.outputs.document import Document
+    from dotruler.registry import get_renderer
+    from dotruler.state import project_lock
+
+    results: list[tuple[str, str] | None] = []
+    renderers = {}
+    for target_id in config.targets.enabled:
+        try:
+            renderer = renderers[target_id] = get_renderer(target_id)()
+        except KeyError as e:
+            results.append(("skipped", str(e)))
+            continue
+
+        if dry_run:
+            override = config.targets.overrides.get(target_id)
+            results.append(("dry-run", renderer.get_output_path(override)))
+        else:
+            results.append((target_id, ""))
+    if dry_run or not renderers:
+        return results
+
+    def write(renderer) -> tuple[str, str, str, int]:
+        path, changed, report = renderer.write_with_report(config, project_dir, document, stream)
+        status = "written" if changed else "unchanged"
+        rel = str(path.relative_to(project_dir))
+        detail = f"{rel} [dim]({report.tokens:,} tokens)[/dim]"
+        if report:
+            detail += f" [yellow]({report.summary()} to fit {_limits_text(renderer, config)})[/yellow]"
+        return status, detail, rel, report.tokens
+
+    with project_lock(project_dir):
+        digests = DigestCache(project_dir)
+        source, lock, stale = _lock_state(config_path, project_dir, renderers, digests)
+        entries = {}
+        if stale is not None:
+            for target_id, entry in lock["outputs"].items():
+                if target_id not in stale:
+                    entries[target_id] = entry
+        todo = [target_id for target_id in renderers if target_id not in entries]
+
+        written = {}
+        if todo:
+            document = Document.from_config(config)
+            with ThreadPoolExecutor(max_workers=workers or len(todo)) as pool:
+                for target_id, result in zip(todo, pool.map(write, [renderers[t] for t in todo])):
+                    written[target_id] = result
+        for target_id, (_, _, rel, tokens) in written.items():
+            entries[target_id] = output_entry(project_dir, rel, tokens, digests)
+        if source is not None:
+            write_lock(project_dir, source, entries)
+        digests.save()
+
+    for index, (target_id, _) in enumerate(results):
+        if target_id in written:
+            results[index] = written[target_id][:2]
+        elif target_id in entries:
+            entry = entries[target_id]
+            results[index] = ("unchanged", f"{Path(entry['path'])} [dim]({entry['tokens']:,} tokens)[/dim]")
+    return results
+
+
+def _lock_state(config_path: Path | None, project_dir: Path, renderers: dict, digests):
+    """Return ``(source, lock, stale)`` for the project's ``.dotruler.lock``.
+
+    ``source`` is the provenance the outputs would be generated from (None
+    without a config path). ``stale`` lists target IDs whose files no longer
+    match the lock, or is None if the lock can't decide, or ``--no-cache``
+    is set.
+    """
+    from dotruler.config import config_sources
+    from dotruler.lockfile import provenance, read_lock, stale_targets
+
+    if config_path is None:
+        return None, None, None
+    source = provenance(config_sources(config_path), renderers)
+    if not dotruler.state.enabled:
+        return source, None, None
+    lock = read_lock(project_dir)
+    return source, lock, stale_targets(lock, source, project_dir, digests)
+
+
+def _limits_text(renderer, config) -> str:
+    """E.g. '12,000 chars and 2,000 tokens'."""
+    return " and ".join(f"{limit:,} {unit}" for limit, unit in renderer.limits(config))
+
+
+def _print_target_results(results: list[tuple[str, str]], indent: str = "  ") -> None:
+    for status, detail in results:
+        if status == "skipped":
+            console.print(f"{indent}[red]✗[/red] {detail}")
+        elif status == "dry-run":
+            console.print(f"{indent}[dim]would write[/dim] {detail}")
+        elif status == "unchanged":
+            console.print(f"{indent}[dim]= {detail} (unchanged)[/dim]")
+        else:
+            console.print(f"{indent}[green]✓[/green] {detail}")
+
+
+def _summarize(statuses: list[str]) -> str:
+    """Format status counts, e.g. '2 written, 1 unchanged, 1 skipped'."""
+    parts = [
+        f"{statuses.count(status)} {status}"
+        for status in ("written", "unchanged", "skipped")
+        if status in statuses
+    ]
+    return ", ".join(parts) or "nothing to do"
+
+
+def _generate_all(
+    root: Path, pattern: str | None, dry_run: bool, workers: int | None, stream: bool = False
+) -> None:
+    """Generate every config found under root in one process."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dotruler.config import find_configs, load_config
+    from dotruler.outputs.cache import render_cache
+
+    config_paths = sorted(root.glob(pattern)) if pattern else find_configs(root)
+    if not config_paths:
+        console.print(f"[red]No .dotruler.toml found[/red] under {root}.")
+        raise typer.Exit(1)
+
+    def run(path: Path) -> tuple[list[tuple[str, str]], str | None]:
+        try:
+            config = load_config(path, persist=True)
+        except (OSError, ValueError) as e:
+            return [], str(e)
+        return _generate_targets(config, path.parent, dry_run, stream, workers=1, config_path=path), None
+
+    console.print(f"[bold]Generating[/bold] {len(config_paths)} configs under {root}...\n")
+    start = time.perf_counter()
+    render_cache.load(root)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(run, config_paths))
+    render_cache.save(root)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    statuses: list[str] = []
+    for path, (results, error) in zip(config_paths, outcomes):
+        rel = path.parent.relative_to(root).as_posix() if path.parent != root else "."
+        if error:
+            failed += 1
+            console.print(f"  [red]✗[/red] {rel}: {error}")
+            continue
+        statuses.extend(status for status, _ in results)
+        skipped = any(status == "skipped" for status, _ in results)
+        mark = "[red]✗[/red]" if skipped else "[green]✓[/green]"
+        console.print(f"  {mark} {rel} [dim]({_summarize([s for s, _ in results])})[/dim]")
+        _print_target_results([r for r in results if r[0] == "skipped"], indent="      ")
+
+    rate = len(config_paths) / elapsed if elapsed else float("inf")
+    console.print()
+    summary = f"{len(statuses)} files would be written" if dry_run else _summarize(statuses)
+    console.print(
+        f"[bold green]Done.[/bold green] {len(config_paths) - failed} configs in {elapsed:.2f}s "
+        f"[dim]({rate:,.0f} configs/s)[/dim]: {summary}."
+    )
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command()
 def generate(
     config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml"),
     directory: Path = typer.Argument(Path("."), help="Project directory to write configs to"),
     dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Preview without writing"),
+    all_configs: bool = typer.Option(
+        False, "--all", "-a", help="Generate every .dotruler.toml found under directory"
+    ),
+    pattern: str = typer.Option(
+        None, "--glob", help="Generate configs matching a glob relative to directory"
+    ),
+    workers: int = typer.Option(
+        None,
+        "--workers",
+        "-j",
+        min=1,
+        help="Parallel workers: targets of one config, or configs for --all/--glob (default: auto)",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream", help="Write large outputs section by section instead of in memory"
+    ),
 ):
     """Generate config files for all enabled AI tools."""
-    # Import outputs to trigger registration
-    import dotruler.outputs  # noqa: F401
-    from dotruler.registry import get_renderer
+    if all_configs or pattern:
+        if config_path:
+            console.print("[red]--config can't be combined with --all or --glob.[/red]")
+            raise typer.Exit(1)
+        _generate_all(directory.resolve(), pattern, dry_run, workers, stream)
+        return
+
+    from dotruler.outputs.cache import render_cache
 
     config, found_path = _load_or_exit(config_path)
     project_dir = directory.resolve()
@@ -147,28 +557,16 @@ def generate(
         f"[bold]Generating[/bold] from {found_path.name}...\n"
     )
 
-    for target_id in config.targets.enabled:
-        try:
-            renderer_cls = get_renderer(target_id)
-        except KeyError as e:
-            console.print(f"  [red]✗[/red] {e}")
-            continue
-
-        renderer = renderer_cls()
-        override = config.targets.overrides.get(target_id)
-        output_path = renderer.get_output_path(override)
-
-        if dry_run:
-            console.print(f"  [dim]would write[/dim] {output_path}")
-        else:
-            written = renderer.write(config, project_dir)
-            console.print(f"  [green]✓[/green] {written.relative_to(project_dir)}")
+    render_cache.load(project_dir)
+    results = _generate_targets(config, project_dir, dry_run, stream, workers, config_path=found_path)
+    render_cache.save(project_dir)
+    _print_target_results(results)
 
     console.print()
     if dry_run:
         console.print("[dim]Dry run — no files written.[/dim]")
     else:
-        console.print(f"[bold green]Done.[/bold green] {len(config.targets.enabled)} configs generated.")
+        console.print(f"[bold green]Done.[/bold green] {_summarize([s for s, _ in results])}.")
 
 
 @app.command()
@@ -176,7 +574,6 @@ def validate(
     config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml"),
 ):
     """Validate your .dotruler.toml config."""
-    import dotruler.outputs  # noqa: F401
     from dotruler.config import validate_config
 
     config, found_path = _load_or_exit(config_path)
@@ -198,80 +595,121 @@ def validate(
 
 
 @app.command(name="list")
-def list_targets():
+def list_targets(
+    tokens: bool = typer.Option(
+        False, "--tokens", "-t", help="Also show estimated tokens per target for the project's config"
+    ),
+    config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml (with --tokens)"),
+):
     """Show all available output targets."""
-    import dotruler.outputs  # noqa: F401
-    from dotruler.registry import list_targets as _list_targets
+    from dotruler.registry import list_specs
+
+    specs = list_specs()
+    rows = []
+    for target_id, spec in specs.items():
+        limit = f"{spec.max_chars:,} {spec.limit_unit}" if spec.max_chars else "—"
+        rows.append((target_id, spec.output_path, spec.description, limit))
+
+    columns = [
+        ("ID", {"style": "bold cyan"}),
+        ("Output File", {}),
+        ("Description", {}),
+        ("Limit", {"justify": "right"}),
+    ]
+    if tokens:
+        config, _ = _load_or_exit(config_path)
+        columns.append(("Tokens", {"justify": "right"}))
+        rows = [(*row, _token_usage(target_id, config)) for row, target_id in zip(rows, specs)]
 
-    targets = _list_targets()
+    console.table(columns, rows, title="Available Targets")
 
-    table = Table(title="Available Targets", show_header=True)
-    table.add_column("ID", style="bold cyan")
-    table.add_column("Output File")
-    table.add_column("Description")
-    table.add_column("Limit", justify="right")
 
-    for target_id, renderer_cls in sorted(targets.items()):
-        r = renderer_cls()
-        limit = f"{r.max_chars:,}" if r.max_chars else "—"
-        table.add_row(target_id, r.default_output_path, r.description, limit)
+def _token_usage(target_id: str, config) -> str:
+    """Estimated tokens of a target's output for ``config``, with its budget if any."""
+    from dotruler.registry import get_renderer
 
-    console.print(table)
+    _, report = get_renderer(target_id)().build_with_report(config)
+    override = config.targets.overrides.get(target_id)
+    if override and override.max_tokens:
+        return f"{report.tokens:,} / {override.max_tokens:,}"
+    return f"{report.tokens:,}"
 
 
 @app.command()
 def diff(
     config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml"),
     directory: Path = typer.Argument(Path("."), help="Project directory"),
+    stat: bool = typer.Option(False, "--stat", help="Only summarize changed lines per file"),
 ):
     """Preview what would change before writing."""
-    import difflib
-
-    import dotruler.outputs  # noqa: F401
+    from dotruler.diff import diff_stat, unified_diff
+    from dotruler.lockfile import DigestCache
+    from dotruler.outputs.cache import render_cache
+    from dotruler.outputs.document import Document
     from dotruler.registry import get_renderer
+    from dotruler.tokens import count_tokens
 
     config, found_path = _load_or_exit(config_path)
     project_dir = directory.resolve()
+    render_cache.load(project_dir)
+    document = Document.from_config(config)
     has_changes = False
+    stats: list[tuple[str, int, int]] = []
 
+    renderers = {}
     for target_id in config.targets.enabled:
         try:
-            renderer_cls = get_renderer(target_id)
+            renderers[target_id] = get_renderer(target_id)()
         except KeyError:
             continue
+    digests = DigestCache(project_dir)
+    _, lock, stale = _lock_state(found_path, project_dir, renderers, digests)
+    digests.save()
 
-        renderer = renderer_cls()
+    for target_id, renderer in renderers.items():
         override = config.targets.overrides.get(target_id)
         output_path = project_dir / renderer.get_output_path(override)
-        new_content = renderer.render(config)
-
-        if output_path.exists():
-            old_content = output_path.read_text(encoding="utf-8")
-            if old_content == new_content:
-                console.print(f"  [dim]unchanged[/dim] {output_path.relative_to(project_dir)}")
-                continue
-
-            diff_lines = difflib.unified_diff(
-                old_content.splitlines(keepends=True),
-                new_content.splitlines(keepends=True),
-                fromfile=str(output_path.relative_to(project_dir)),
-                tofile=str(output_path.relative_to(project_dir)),
-            )
-            console.print(f"\n  [yellow]modified[/yellow] {output_path.relative_to(project_dir)}")
-            for line in diff_lines:
-                line = line.rstrip("\n")
-                if line.startswith("+") and not line.startswith("+++"):
-                    console.print(f"    [green]{line}[/green]")
-                elif line.startswith("-") and not line.startswith("---"):
-                    console.print(f"    [red]{line}[/red]")
-                else:
-                    console.print(f"    {line}")
-        else:
-            console.print(f"\n  [green]new[/green] {output_path.relative_to(project_dir)}")
+        rel = str(output_path.relative_to(project_dir))
+        if stale is not None and target_id not in stale:
+            if not stat:
+                entry = lock["outputs"][target_id]
+                console.print(f"  [dim]unchanged[/dim] {entry['path']} [dim]({entry['tokens']:,} tokens)[/dim]")
+            continue
+
+        new_content, report = renderer.build_with_report(config, document)
+        if report and not stat:
+            console.print(f"  [yellow]packed[/yellow] {rel}: {report.summary()} to fit {_limits_text(renderer, config)}")
+            console.lines([("dim", f"    - {item}") for item in report.dropped_rules + report.dropped_notes])
+
+        try:
+            old_content = output_path.read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            old_content = None
+        if old_content == new_content:
+            if not stat:
+                console.print(f"  [dim]unchanged[/dim] {rel} [dim]({report.tokens:,} tokens)[/dim]")
+            continue
 
         has_changes = True
+        old_lines = old_content.splitlines() if old_content is not None else []
+        new_lines = new_content.splitlines()
+        if stat:
+            stats.append((rel, *diff_stat(old_lines, new_lines)))
+        elif old_content is not None:
+            console.print(
+                f"\n  [yellow]modified[/yellow] {rel} "
+                f"[dim]({count_tokens(old_content):,} → {report.tokens:,} tokens)[/dim]"
+            )
+            console.lines(
+                [(_diff_style(line), f"    {line}") for line in unified_diff(old_lines, new_lines, rel, rel)]
+            )
+        else:
+            console.print(f"\n  [green]new[/green] {rel} [dim]({report.tokens:,} tokens)[/dim]")
 
-    if not has_changes:
+    render_cache.save(project_dir)
+    if stat:
+        _print_diff_stat(stats)
+    elif not has_changes:
         console.print("\n[dim]Everything is in sync.[/dim]")
     else:
         console.print(
@@ -279,6 +717,146 @@ def diff(
         )
 
 
+def _diff_style(line: str) -> str:
+    if line.startswith(("+++", "---")):
+        return "bold"
+    return {"+": "green", "-": "red", "@": "cyan"}.get(line[:1], "")
+
+
+def _print_diff_stat(stats: list[tuple[str, int, int]]) -> None:
+    """Print ``git diff --stat``-style lines for ``(path, insertions, deletions)``."""
+    if not stats:
+        console.print("[dim]Everything is in sync.[/dim]")
+        return
+    width = max(len(path) for path, _, _ in stats)
+    most = max(added + removed for _, added, removed in stats)
+    scale = min(1.0, 50 / most) if most else 1.0
+    for path, added, removed in stats:
+        plus, minus = round(added * scale) or bool(added), round(removed * scale) or bool(removed)
+        console.print(f" {path:<{width}} | {added + removed:>5} [green]{'+' * plus}[/green][red]{'-' * minus}[/red]")
+    insertions = sum(added for _, added, _ in stats)
+    deletions = sum(removed for _, _, removed in stats)
+    files = "1 file" if len(stats) == 1 else f"{len(stats)} files"
+    console.print(f" {files} changed, {insertions} insertions(+), {deletions} deletions(-)")
+
+
+def _stale_outputs(config, project_dir: Path, config_path: Path | None = None) -> list[str]:
+    """Generated files under ``project_dir`` that don't match what ``generate`` would write.
+
+    If ``.dotruler.lock`` is current for ``config_path``, outputs are only
+    stat'ed and hashed against it; otherwise every target is rendered and compared.
+    """
+    from dotruler.fileio import is_unchanged
+    from dotruler.lockfile import DigestCache
+    from dotruler.registry import get_renderer
+
+    renderers = {}
+    for target_id in config.targets.enabled:
+        try:
+            renderers[target_id] = get_renderer(target_id)()
+        except KeyError:
+            continue
+
+    digests = DigestCache(project_dir)
+    _, lock, stale_ids = _lock_state(config_path, project_dir, renderers, digests)
+    digests.save()
+    if stale_ids is not None:
+        return [str(project_dir / lock["outputs"][target_id]["path"]) for target_id in stale_ids]
+
+    stale: list[str] = []
+    for target_id, renderer in renderers.items():
+        override = config.targets.overrides.get(target_id)
+        output_path = project_dir / renderer.get_output_path(override)
+        if not is_unchanged(output_path, renderer.build(config).encode("utf-8")):
+            stale.append(str(output_path))
+    return stale
+
+
+@app.command()
+def check(
+    config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml"),
+    directory: Path = typer.Argument(Path("."), help="Project directory"),
+    all_configs: bool = typer.Option(
+        False, "--all", "-a", help="Check every .dotruler.toml found under directory"
+    ),
+    pattern: str = typer.Option(None, "--glob", help="Check configs matching a glob relative to directory"),
+    workers: int = typer.Option(None, "--workers", "-j", min=1, help="Parallel configs (default: auto)"),
+):
+    """Exit 1 if any generated file is stale or missing. Prints nothing when in sync."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dotruler.config import find_configs, load_config
+    from dotruler.outputs.cache import render_cache
+
+    root = directory.resolve()
+    if not (all_configs or pattern):
+        config, found_path = _load_or_exit(config_path)
+        render_cache.load(root)
+        stale = _stale_outputs(config, root, found_path)
+        render_cache.save(root)
+        errors: list[str] = []
+    else:
+        if config_path:
+            console.print("[red]--config can't be combined with --all or --glob.[/red]")
+            raise typer.Exit(1)
+        config_paths = sorted(root.glob(pattern)) if pattern else find_configs(root)
+        if not config_paths:
+            console.print(f"[red]No .dotruler.toml found[/red] under {root}.")
+            raise typer.Exit(1)
+
+        def run(path: Path) -> tuple[list[str], str | None]:
+            try:
+                return _stale_outputs(load_config(path, persist=True), path.parent, path), None
+            except (OSError, ValueError) as e:
+                return [], f"{path}: {e}"
+
+        render_cache.load(root)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(run, config_paths))
+        render_cache.save(root)
+        stale = [path for paths, _ in outcomes for path in paths]
+        errors = [error for _, error in outcomes if error]
+
+    for error in errors:
+        console.print(f"[red]✗[/red] {error}")
+    for path in stale:
+        console.print(f"[yellow]stale[/yellow] {Path(path).relative_to(root)}")
+    if stale or errors:
+        raise typer.Exit(1)
+
+
+@app.command()
+def watch(
+    config_path: Path = typer.Option(None, "--config", "-c", help="Path to .dotruler.toml"),
+    directory: Path = typer.Argument(Path("."), help="Project directory to write configs to"),
+    interval: float = typer.Option(0.5, "--interval", help="Seconds between polls", min=0.05),
+    debounce: float = typer.Option(
+        0.3, "--debounce", help="Seconds a change must settle before regenerating", min=0.0
+    ),
+):
+    """Regenerate configs whenever .dotruler.toml changes."""
+    from dotruler.watch import ConfigWatcher
+
+    _, found_path = _load_or_exit(config_path)
+    watcher = ConfigWatcher(found_path, directory.resolve(), debounce=debounce)
+
+    def report(results: list[tuple[str, str]]) -> None:
+        stamp = time.strftime("%H:%M:%S")
+        for status, detail in results:
+            if status == "error":
+                console.print(f"[dim]{stamp}[/dim] [red]✗[/red] {detail}")
+        changed = [r for r in results if r[0] in ("written", "skipped")]
+        _print_target_results(changed, indent=f"[dim]{stamp}[/dim] ")
+        if not any(status == "error" for status, _ in results):
+            console.print(f"[dim]{stamp} {_summarize([s for s, _ in results])}[/dim]")
+
+    console.print(f"[bold]Watching[/bold] {found_path} [dim](Ctrl+C to stop)[/dim]\n")
+    try:
+        watcher.run(report, interval=interval)
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped watching.[/dim]")
+
+
 @app.command()
 def version():
     """Show the current version."""
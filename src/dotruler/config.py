@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+import time
 import tomllib
 from pathlib import Path
 
@@ -14,25 +16,219 @@ from dotruler.models import (
     TargetOverride,
     TargetsConfig,
 )
+from dotruler.state import RACY_WINDOW_NS, cache_file, load_snapshot, save_snapshot
 
 CONFIG_FILENAME = ".dotruler.toml"
 
+# Bump when the snapshot format or the meaning of parsed TOML changes.
+CONFIG_CACHE_VERSION = 1
+CONFIG_CACHE_NAME = "config.marshal"
+
+# abspath → (chain of (path, (mtime_ns, size, inode)), value)
+_MERGED_MEMO: dict[str, tuple[tuple, dict]] = {}
+_CONFIG_MEMO: dict[str, tuple[tuple, AiRulesConfig]] = {}
+
 
 def find_config(start: Path | None = None) -> Path | None:
     """Find .dotruler.toml starting from the given directory, walking up."""
-    current = start or Path.cwd()
-    for directory in [current, *current.parents]:
-        config_path = directory / CONFIG_FILENAME
-        if config_path.exists():
-            return config_path
-    return None
+    return ConfigResolver().resolve_dir(start or Path.cwd())
+
+
+class ConfigResolver:
+    """Map paths to their owning .dotruler.toml, sharing lookups across paths.
+
+    Each directory is checked with a single ``os.stat`` and the answer is
+    cached for it and every directory visited below it, so resolving many
+    paths costs one stat per unique ancestor directory. Results go stale if
+    configs are created or deleted; use a fresh resolver per batch.
+    """
+
+    def __init__(self) -> None:
+        self._dirs: dict[str, str | None] = {}
+
+    def resolve_dir(self, directory: Path | str) -> Path | None:
+        """Find the config for a directory, walking up from the directory itself."""
+        current = os.path.abspath(directory)
+        visited: list[str] = []
+        found: str | None = None
+        while True:
+            if current in self._dirs:
+                found = self._dirs[current]
+                break
+            visited.append(current)
+            candidate = os.path.join(current, CONFIG_FILENAME)
+            try:
+                os.stat(candidate)
+            except OSError:
+                pass
+            else:
+                found = candidate
+                break
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+        for directory in visited:
+            self._dirs[directory] = found
+        return Path(found) if found else None
+
+    def resolve(self, path: Path | str) -> Path | None:
+        """Find the config owning a file path. The file itself need not exist."""
+        return self.resolve_dir(os.path.dirname(os.path.abspath(path)))
+
+    def resolve_many(self, paths) -> dict[Path, Path | None]:
+        """Resolve many file paths, e.g. the changed files of a commit."""
+        return {Path(path): self.resolve(path) for path in paths}
+
+
+def find_configs(root: Path) -> list[Path]:
+    """Find every .dotruler.toml under root, skipping common build dirs."""
+    from dotruler.scanner import SKIP_DIRS
+
+    found: list[Path] = []
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name == CONFIG_FILENAME:
+                        found.append(Path(entry.path))
+                    elif entry.name not in SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return sorted(found)
+
+
+def load_config(path: Path, use_cache: bool = True, persist: bool = False) -> AiRulesConfig:
+    """Load and parse .dotruler.toml into typed config.
+
+    A config may name parent configs with a top-level ``extends`` (a path or
+    list of paths relative to it); parents are merged first, see ``_merge``.
+
+    Parsed configs and merged parents are memoized per path and reused while
+    the mtime, size and inode of every file in the chain are unchanged, so
+    callers must treat the result as read-only. A root shared by many
+    packages is parsed and merged once. With ``persist``, each file's parsed
+    TOML is also snapshotted to ``.dotruler/cache`` so a fresh process can
+    skip parsing.
+    """
+    key = os.path.abspath(path)
+    if not use_cache:
+        return _parse_config(_load_merged(key, persist=False, use_cache=False)[1])
+
+    chain, merged = _load_merged(key, persist, use_cache=True)
+    cached = _CONFIG_MEMO.get(key)
+    if cached and cached[0] == chain:
+        return cached[1]
+
+    config = _parse_config(merged)
+    _CONFIG_MEMO[key] = (chain, config)
+    return config
+
+
+def config_sources(path: Path) -> list[Path]:
+    """Return the config file and every file it extends, child first."""
+    chain, _ = _load_merged(os.path.abspath(path), persist=False, use_cache=True)
+    return [Path(source) for source, _ in chain]
+
+
+def _signature(path: str) -> tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _load_merged(
+    path: str, persist: bool, use_cache: bool, _stack: tuple[str, ...] = ()
+) -> tuple[tuple, dict]:
+    """Load a config with its ``extends`` parents merged in.
+
+    Returns ``(chain, raw)`` where chain is ``((path, signature), ...)`` for
+    every file involved, used to validate memoized results.
+    """
+    if path in _stack:
+        cycle = " -> ".join(os.path.basename(os.path.dirname(p)) or p for p in (*_stack, path))
+        raise ValueError(f"circular extends in {path}: {cycle}")
+
+    if use_cache:
+        cached = _MERGED_MEMO.get(path)
+        if cached and all(_signature(source) == sig for source, sig in cached[0]):
+            return cached
+
+    signature = _signature(path)
+    raw = _load_raw(Path(path), signature, persist) if use_cache else _read_toml(path)
+
+    chain: list[tuple[str, tuple[int, int, int]]] = [(path, signature)]
+    merged: dict = {}
+    for parent in _extends(raw, path):
+        parent_chain, parent_raw = _load_merged(parent, persist, use_cache, (*_stack, path))
+        chain.extend(parent_chain)
+        merged = _merge(merged, parent_raw)
+    merged = _merge(merged, {k: v for k, v in raw.items() if k != "extends"})
+
+    result = (tuple(chain), merged)
+    if use_cache:
+        _MERGED_MEMO[path] = result
+    return result
+
+
+def _extends(raw: dict, path: str) -> list[str]:
+    """Absolute paths of the parents named by ``extends``."""
+    value = raw.get("extends", [])
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{path}: extends must be a path or a list of paths")
+    base = os.path.dirname(path)
+    return [os.path.normpath(os.path.join(base, parent)) for parent in value]
+
+
+# Lists that accumulate across extends instead of being replaced.
+_APPEND_KEYS = {("style", "rules"), ("architecture", "notes")}
+
+
+def _merge(base: dict, override: dict, _keys: tuple[str, ...] = ()) -> dict:
+    """Merge raw config tables without mutating either input.
+
+    Tables merge recursively and scalars are replaced. ``style.rules``,
+    ``architecture.notes`` and per-target ``extra_rules`` accumulate
+    (parent first); other lists, like ``targets.enabled``, are replaced.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        keys = (*_keys, key)
+        current = merged.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            merged[key] = _merge(current, value, keys)
+        elif (
+            isinstance(current, list)
+            and isinstance(value, list)
+            and (keys in _APPEND_KEYS or (keys[0] == "targets" and keys[-1] == "extra_rules"))
+        ):
+            merged[key] = current + value
+        else:
+            merged[key] = value
+    return merged
+
+
+def _read_toml(path: str) -> dict:
+    with open(path, "rb") as f:
+        return tomllib.load(f)
 
 
-def load_config(path: Path) -> AiRulesConfig:
-    """Load and parse .dotruler.toml into typed config."""
-    with open(path, "rb") as f:
-        raw = tomllib.load(f)
-    return _parse_config(raw)
+def _load_raw(path: Path, signature: tuple[int, int, int], persist: bool) -> dict:
+    """Read TOML for a config, going through its on-disk snapshot if ``persist``."""
+    snapshot_path = cache_file(path.parent, CONFIG_CACHE_NAME)
+    if persist:
+        snapshot = load_snapshot(snapshot_path, CONFIG_CACHE_VERSION)
+        if snapshot and snapshot[0] == signature:
+            return snapshot[1]
+
+    raw = _read_toml(path)
+    if persist and signature[0] < time.time_ns() - RACY_WINDOW_NS:
+        save_snapshot(snapshot_path, CONFIG_CACHE_VERSION, (signature, raw))
+    return raw
 
 
 def _parse_config(raw: dict) -> AiRulesConfig:
@@ -86,9 +282,13 @@ def _parse_targets(data: dict) -> TargetsConfig:
         if key == "enabled":
             continue
         if isinstance(value, dict):
+            max_tokens = value.get("max_tokens", 0)
+            if not isinstance(max_tokens, int) or isinstance(max_tokens, bool) or max_tokens < 0:
+                raise ValueError(f"targets.{key}.max_tokens must be a non-negative integer, got {max_tokens!r}")
             overrides[key] = TargetOverride(
                 extra_rules=value.get("extra_rules", []),
                 output_path=value.get("output_path", ""),
+                max_tokens=max_tokens,
             )
 
     return TargetsConfig(enabled=enabled, overrides=overrides)
@@ -107,15 +307,17 @@ def validate_config(config: AiRulesConfig) -> list[str]:
     if not config.targets.enabled:
         issues.append("[error] targets.enabled is empty — no output files will be generated")
 
-    from dotruler.registry import list_targets
+    from dotruler.registry import target_ids
 
-    available = list_targets()
+    available = set(target_ids())
     for target_id in config.targets.enabled:
         if target_id not in available:
             issues.append(f"[error] unknown target '{target_id}' in targets.enabled")
 
-    for target_id in config.targets.overrides:
+    for target_id, override in config.targets.overrides.items():
         if target_id not in available:
             issues.append(f"[warn] override for unknown target '{target_id}'")
+        if not isinstance(override.max_tokens, int) or override.max_tokens < 0:
+            issues.append(f"[error] targets.{target_id}.max_tokens must be a non-negative integer")
 
     return issues
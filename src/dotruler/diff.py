@@ -0,0 +1,122 @@
+"""Unified diffs of generated files that stay fast on very large outputs.
+
+Generated files are sequences of sections separated by blank lines (a
+heading, a bullet list, a footer). Sections are matched first, and line
+level matching only runs inside the sections that changed, so editing one
+rule in a file with thousands of lines costs a comparison of section texts
+plus a diff of one section. Hunks are grouped and formatted like
+``difflib.unified_diff``, with context taken from the neighbouring unchanged
+sections.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from difflib import SequenceMatcher
+
+Opcode = tuple[str, int, int, int, int]
+
+
+def split_sections(lines: list[str]) -> list[tuple[int, int]]:
+    """``(start, stop)`` line ranges of ``lines``; a section starts at the first line after a blank one."""
+    sections: list[tuple[int, int]] = []
+    start = 0
+    for i in range(1, len(lines)):
+        if not lines[i - 1].strip() and lines[i].strip():
+            sections.append((start, i))
+            start = i
+    if lines:
+        sections.append((start, len(lines)))
+    return sections
+
+
+def opcodes(a: list[str], b: list[str]) -> list[Opcode]:
+    """Line opcodes (as ``SequenceMatcher.get_opcodes``) turning ``a`` into ``b``, section by section."""
+    a_sections = split_sections(a)
+    b_sections = split_sections(b)
+    a_keys = ["\n".join(a[i:j]) for i, j in a_sections]
+    b_keys = ["\n".join(b[i:j]) for i, j in b_sections]
+
+    codes: list[Opcode] = []
+
+    def add(tag: str, i1: int, i2: int, j1: int, j2: int) -> None:
+        if i1 == i2 and j1 == j2:
+            return
+        if codes and codes[-1][0] == tag == "equal":
+            i1, j1 = codes.pop()[1::2]
+        codes.append((tag, i1, i2, j1, j2))
+
+    def start(sections: list[tuple[int, int]], index: int, total: int) -> int:
+        return sections[index][0] if index < len(sections) else total
+
+    matcher = SequenceMatcher(None, a_keys, b_keys, autojunk=False)
+    for tag, s1, s2, t1, t2 in matcher.get_opcodes():
+        i1, i2 = start(a_sections, s1, len(a)), start(a_sections, s2, len(a))
+        j1, j2 = start(b_sections, t1, len(b)), start(b_sections, t2, len(b))
+        if tag == "equal":
+            add("equal", i1, i2, j1, j2)
+            continue
+        for sub in SequenceMatcher(None, a[i1:i2], b[j1:j2]).get_opcodes():
+            add(sub[0], i1 + sub[1], i1 + sub[2], j1 + sub[3], j1 + sub[4])
+    return codes
+
+
+def grouped(codes: list[Opcode], n: int = 3) -> Iterator[list[Opcode]]:
+    """Hunks of ``codes`` with up to ``n`` lines of context, as ``SequenceMatcher.get_grouped_opcodes``."""
+    codes = list(codes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(a: list[str], b: list[str], fromfile: str = "", tofile: str = "", n: int = 3) -> Iterator[str]:
+    """Unified diff lines (without line endings) from ``a`` to ``b``; nothing if they're equal."""
+    if a == b:
+        return
+    yield f"--- {fromfile}"
+    yield f"+++ {tofile}"
+    for group in grouped(opcodes(a, b), n):
+        first, last = group[0], group[-1]
+        yield f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@"
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for line in a[i1:i2]:
+                    yield f" {line}"
+                continue
+            for line in a[i1:i2]:
+                yield f"-{line}"
+            for line in b[j1:j2]:
+                yield f"+{line}"
+
+
+def diff_stat(a: list[str], b: list[str]) -> tuple[int, int]:
+    """``(insertions, deletions)`` in lines from ``a`` to ``b``."""
+    if a == b:
+        return 0, 0
+    added = removed = 0
+    for tag, i1, i2, j1, j2 in opcodes(a, b):
+        if tag != "equal":
+            removed += i2 - i1
+            added += j2 - j1
+    return added, removed
@@ -0,0 +1,120 @@
+"""File helpers shared by the commands that write or compare generated files."""
+
+from __future__ import annotations
+
+import os
+import secrets
+from collections.abc import Iterable
+from pathlib import Path
+
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+
+
+def is_unchanged(path: Path, data: bytes) -> bool:
+    """Return True if ``path`` already holds exactly ``data``.
+
+    A size mismatch is detected from ``stat`` alone, so most changed files
+    are never read.
+    """
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` to ``path`` unless it already holds it. Returns True if written.
+
+    The write is atomic: readers see either the old file or the new one,
+    never a partial write.
+    """
+    if is_unchanged(path, data):
+        return False
+    path = _target(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        _replace(tmp, path)
+    except BaseException:
+        _discard(tmp)
+        raise
+    return True
+
+
+def write_chunks_if_changed(path: Path, chunks: Iterable[bytes]) -> bool:
+    """Stream ``chunks`` into ``path`` unless it already holds exactly that content.
+
+    Chunks go to a temp file beside ``path`` while being compared with the
+    current file, so memory stays bounded by the largest chunk. The temp file
+    is renamed over ``path`` only if the content differs; otherwise it is
+    discarded. Returns True if written.
+    """
+    path = _target(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        current = open(path, "rb")
+    except OSError:
+        current = None
+    fd, tmp = _create_temp(path)
+    try:
+        same = current is not None
+        with os.fdopen(fd, "wb") as out:
+            for chunk in chunks:
+                out.write(chunk)
+                if same:
+                    same = current.read(len(chunk)) == chunk
+            same = same and current.read(1) == b""
+        if same:
+            _discard(tmp)
+            return False
+        _replace(tmp, path)
+        return True
+    except BaseException:
+        _discard(tmp)
+        raise
+    finally:
+        if current is not None:
+            current.close()
+
+
+def _target(path: Path) -> Path:
+    """The file to replace: the final target if ``path`` is a symlink, so the link survives."""
+    return Path(os.path.realpath(path))
+
+
+def _create_temp(path: Path) -> tuple[int, str]:
+    """Create and open a new temp file beside ``path``.
+
+    It's created 0666 so the kernel applies the umask, as for a plain
+    open(); reading the umask would mean setting it, which races with other
+    threads creating files.
+    """
+    while True:
+        tmp = os.path.join(path.parent, f".{path.name}.{secrets.token_hex(4)}")
+        try:
+            return os.open(tmp, _TEMP_FLAGS, 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _replace(tmp: str, path: Path) -> None:
+    """Rename a finished temp file over ``path``, keeping the mode ``path`` already has."""
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        pass
+    else:
+        os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def _discard(tmp: str) -> None:
+    try:
+        os.unlink(tmp)
+    except OSError:
+        pass
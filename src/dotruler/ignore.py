@@ -0,0 +1,231 @@
+""".gitignore matching for the scanner.
+
+Each ``.gitignore`` is compiled once into regular expressions (files
+without negations are merged into a few alternations) and cached by the
+file's ``(mtime_ns, size, inode)``, so a tree with the same ignore file in
+thousands of directories, or a rescan, doesn't recompile anything.
+
+``IgnoreMatcher`` combines the ignore files in effect for a directory: the
+deepest file with a matching pattern decides, and within a file the last
+matching pattern wins, as in git. The ``.gitignore`` files inside the
+scanned tree are read, and so are those above it up to the git work-tree
+root (see ``ancestor_sources``); ``.git/info/exclude`` and global excludes
+are not.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+
+GITIGNORE = ".gitignore"
+
+# (directory relative to the scan root, path of its .gitignore, stat signature)
+# For a .gitignore above the scan root, the first item is "/" followed by the
+# scan root's path relative to the .gitignore's directory.
+IgnoreSource = tuple[str, str, tuple[int, int, int]]
+
+
+def _translate(pattern: str) -> str:
+    """Regex source for a gitignore glob (without negation or trailing slash)."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                before_ok = i == 0 or pattern[i - 1] == "/"
+                after = pattern[i + 2 : i + 3]
+                if before_ok and after == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if before_ok and not after:
+                    out.append(".*")
+                    i += 2
+                    continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            regex, i = _translate_class(pattern, i)
+            out.append(regex)
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _translate_class(pattern: str, start: int) -> tuple[str, int]:
+    """Regex source for the bracket expression at ``start`` and the index of its closing ``]``.
+
+    As in git, a ``]`` right after ``[`` or ``[!`` is a literal, and a class
+    that is never closed makes the pattern invalid (``re.error``).
+    """
+    i = start + 1
+    negated = pattern[i : i + 1] in ("!", "^")
+    if negated:
+        i += 1
+    body: list[str] = []
+    first = i
+    n = len(pattern)
+    while i < n and (pattern[i] != "]" or i == first):
+        c = pattern[i]
+        if c == "\\" and i + 1 < n:
+            i += 1
+            body.append(re.escape(pattern[i]))
+        elif c == "-" and body and i + 1 < n and pattern[i + 1] != "]":
+            body.append("-")
+        else:
+            body.append(re.escape(c))
+        i += 1
+    if i >= n:
+        raise re.error("unterminated character set", pattern, start)
+    # A negated class still never matches a path separator.
+    return f"[{'^/' if negated else ''}{''.join(body)}]", i
+
+
+class IgnoreFile:
+    """The compiled patterns of one ``.gitignore``.
+
+    Patterns without a slash only ever match an entry's name, so they are
+    matched against the name alone; the others against the path relative to
+    the ``.gitignore``'s directory.
+    """
+
+    __slots__ = ("_rules", "_merged")
+
+    def __init__(self, text: str) -> None:
+        rules: list[tuple[re.Pattern[str], bool, bool, bool]] = []  # (regex, negated, dir_only, by_name)
+        for line in text.splitlines():
+            if not line or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negated = line.startswith("!")
+            if negated or line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            by_name = "/" not in line
+            try:
+                regex = re.compile(_translate(line.lstrip("/")))
+            except re.error:
+                continue  # git skips patterns it can't parse
+            rules.append((regex, negated, dir_only, by_name))
+        self._rules = tuple(rules)
+        # Without negations any match ignores, so one regex per (entry kind, subject) will do.
+        self._merged = None
+        if not any(negated for _, negated, _, _ in rules):
+            self._merged = {
+                (is_dir, by_name): _union(
+                    r for r, _, dir_only, name_rule in rules if name_rule == by_name and (is_dir or not dir_only)
+                )
+                for is_dir in (False, True)
+                for by_name in (False, True)
+            }
+
+    def match(self, rel: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included by a negation, None if no pattern matches."""
+        name = rel.rpartition("/")[2]
+        if self._merged is not None:
+            by_name = self._merged[is_dir, True]
+            by_path = self._merged[is_dir, False]
+            if (by_name and by_name.fullmatch(name)) or (by_path and by_path.fullmatch(rel)):
+                return True
+            return None
+        for regex, negated, dir_only, by_name in reversed(self._rules):
+            if (is_dir or not dir_only) and regex.fullmatch(name if by_name else rel):
+                return not negated
+        return None
+
+
+def _union(regexes) -> re.Pattern[str] | None:
+    sources = [f"(?:{r.pattern})" for r in regexes]
+    return re.compile("|".join(sources)) if sources else None
+
+
+@lru_cache(maxsize=256)
+def _compile(text: str) -> IgnoreFile:
+    return IgnoreFile(text)
+
+
+@lru_cache(maxsize=1024)
+def load_ignore_file(path: str, signature: tuple[int, int, int]) -> IgnoreFile:
+    """Compiled ``.gitignore`` at ``path``; ``signature`` keys the cache. Unreadable → no patterns."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return _compile(f.read())
+    except OSError:
+        return _compile("")
+
+
+def signature(st: os.stat_result) -> tuple[int, int, int]:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class IgnoreMatcher:
+    """The ``.gitignore`` files in effect for a directory, from the work-tree root down."""
+
+    __slots__ = ("_files",)
+
+    def __init__(self, sources: tuple[IgnoreSource, ...]) -> None:
+        self._files = [(base, load_ignore_file(path, sig)) for base, path, sig in reversed(sources)]
+
+    def ignored(self, rel: str, is_dir: bool) -> bool:
+        """Whether ``rel`` (relative to the scan root) is ignored."""
+        for base, ignore_file in self._files:
+            if base.startswith("/"):
+                result = ignore_file.match(f"{base[1:]}/{rel}", is_dir)
+            elif base:
+                if not rel.startswith(base + "/"):
+                    continue
+                result = ignore_file.match(rel[len(base) + 1 :], is_dir)
+            else:
+                result = ignore_file.match(rel, is_dir)
+            if result is not None:
+                return result
+        return False
+
+
+@lru_cache(maxsize=1024)
+def matcher(sources: tuple[IgnoreSource, ...]) -> IgnoreMatcher | None:
+    """Shared matcher for a chain of ignore files; None if there are none."""
+    return IgnoreMatcher(sources) if sources else None
+
+
+def ancestor_sources(directory: str) -> tuple[IgnoreSource, ...]:
+    """The ``.gitignore`` files above ``directory`` that git applies to it, outermost first.
+
+    Walks up to the git work-tree root, the nearest directory containing
+    ``.git``. Outside a work tree, or at its root, there are none.
+    """
+    directory = os.path.realpath(directory)
+    if os.path.lexists(os.path.join(directory, ".git")):
+        return ()
+    parents: list[str] = []
+    current = directory
+    while True:
+        parent = os.path.dirname(current)
+        if parent == current:
+            return ()
+        parents.append(parent)
+        if os.path.lexists(os.path.join(parent, ".git")):
+            break
+        current = parent
+    sources: list[IgnoreSource] = []
+    for parent in reversed(parents):
+        path = os.path.join(parent, GITIGNORE)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        rel = os.path.relpath(directory, parent).replace(os.sep, "/")
+        sources.append((f"/{rel}", path, signature(st)))
+    return tuple(sources)
@@ -0,0 +1,152 @@
+""".dotruler.lock: what generate produced, so staleness can be decided without rendering.
+
+The lock sits next to the generated files and records a hash of the config
+sources (the config and everything it ``extends``), the dotruler version,
+tokenizer and renderer versions, and the SHA-256, size and estimated tokens
+of each output. It is rewritten when any of that changes: besides the
+outputs, that includes any edit to the config (even a comment), a dotruler
+upgrade or a different ``--tokenizer``. Otherwise it stays byte-identical,
+so it can be committed.
+
+If the lock's provenance still matches, a target is in sync when its file
+still has the recorded hash. Hashes of unchanged files are remembered by
+``(mtime_ns, size, inode)`` in ``.dotruler/cache``, so in the common case
+deciding staleness costs a ``stat`` per output and no reads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from dotruler import __version__
+from dotruler.fileio import write_if_changed
+from dotruler.state import RACY_WINDOW_NS, cache_file, load_snapshot, save_snapshot
+
+LOCK_NAME = ".dotruler.lock"
+LOCK_VERSION = 1
+DIGEST_CACHE_VERSION = 1
+DIGEST_CACHE_NAME = "digests.marshal"
+
+
+def lock_path(project_dir: Path) -> Path:
+    return project_dir / LOCK_NAME
+
+
+def source_hash(sources: list[Path]) -> str:
+    """SHA-256 over the config sources' names and bytes."""
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.name.encode("utf-8") + b"\0")
+        digest.update(source.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def provenance(sources: list[Path], renderers: dict) -> dict:
+    """Everything that determines the outputs besides the renderer code itself.
+
+    ``renderers`` maps target IDs to renderer instances.
+    """
+    from dotruler.tokens import tokenizer_name
+
+    return {
+        "dotruler": __version__,
+        "config": source_hash(sources),
+        "tokenizer": tokenizer_name(),
+        "renderers": {
+            target_id: f"{type(r).__module__}.{type(r).__qualname__}:{r.version}"
+            for target_id, r in sorted(renderers.items())
+        },
+    }
+
+
+def read_lock(project_dir: Path) -> dict | None:
+    """The parsed lock, or None if missing, unreadable or from another lock version."""
+    try:
+        lock = json.loads(lock_path(project_dir).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(lock, dict) or lock.get("version") != LOCK_VERSION:
+        return None
+    return lock
+
+
+def write_lock(project_dir: Path, source: dict, outputs: dict[str, dict]) -> bool:
+    """Write the lock if its content changed. ``outputs`` maps target IDs to entries
+    with ``path`` (relative to ``project_dir``), ``sha256``, ``size`` and ``tokens``."""
+    lock = {"version": LOCK_VERSION, "source": source, "outputs": dict(sorted(outputs.items()))}
+    data = (json.dumps(lock, indent=2) + "\n").encode("utf-8")
+    return write_if_changed(lock_path(project_dir), data)
+
+
+def output_entry(project_dir: Path, rel_path: str, tokens: int, digests: DigestCache) -> dict:
+    """Lock entry for a freshly generated file."""
+    path = project_dir / rel_path
+    sha, size = digests.digest(path)
+    return {"path": Path(rel_path).as_posix(), "sha256": sha, "size": size, "tokens": tokens}
+
+
+def stale_targets(lock: dict | None, source: dict, project_dir: Path, digests: DigestCache) -> list[str] | None:
+    """Target IDs whose files no longer match the lock.
+
+    Returns None when the lock can't decide: there is no lock, or the
+    config, enabled targets or any version changed since it was written.
+    """
+    if lock is None or lock.get("source") != source:
+        return None
+    outputs = lock.get("outputs", {})
+    if set(outputs) != set(source["renderers"]):
+        return None
+    stale = []
+    for target_id, entry in outputs.items():
+        path = project_dir / entry["path"]
+        if digests.digest(path, expected_size=entry["size"]) != (entry["sha256"], entry["size"]):
+            stale.append(target_id)
+    return sorted(stale)
+
+
+class DigestCache:
+    """SHA-256 of files, remembered by ``(mtime_ns, size, inode)`` across runs.
+
+    A hash taken within the racy window of the file's mtime isn't trusted
+    later: the file may have been rewritten within the same mtime tick.
+    """
+
+    def __init__(self, project_dir: Path) -> None:
+        self._path = cache_file(project_dir, DIGEST_CACHE_NAME)
+        self._entries: dict[str, tuple] = load_snapshot(self._path, DIGEST_CACHE_VERSION) or {}
+        self._dirty = False
+
+    def digest(self, path: Path, expected_size: int | None = None) -> tuple[str, int] | None:
+        """``(sha256, size)`` of ``path``, or None if it's missing.
+
+        If ``expected_size`` is given and the size differs, the file isn't read.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if expected_size is not None and st.st_size != expected_size:
+            return "", st.st_size
+        key = str(path)
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._entries.get(key)
+        if cached and cached[0] == signature and signature[0] < cached[2] - RACY_WINDOW_NS:
+            return cached[1], st.st_size
+        hashed_ns = time.time_ns()
+        try:
+            with open(path, "rb") as f:
+                sha = hashlib.file_digest(f, "sha256").hexdigest()  # reads in blocks
+        except OSError:
+            return None
+        self._entries[key] = (signature, sha, hashed_ns)
+        self._dirty = True
+        return sha, st.st_size
+
+    def save(self) -> None:
+        if self._dirty:
+            save_snapshot(self._path, DIGEST_CACHE_VERSION, self._entries)
+            self._dirty = False
@@ -1,52 +1,132 @@
-"""Typed config dataclasses for .dotruler.toml."""
+"""Typed config dataclasses for .dotruler.toml.
+
+Models are frozen and slotted: list fields are stored as tuples and
+``targets.overrides`` as a ``FrozenMap``, so a config is immutable and
+hashable and many of them can be held in memory cheaply. Constructors still
+accept lists and dicts; use ``dataclasses.replace`` to derive a changed copy.
+"""
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, field
+from typing import TypeVar
+
+V = TypeVar("V")
+
+
+class FrozenMap(Mapping[str, V]):
+    """Immutable, hashable ``str``-keyed mapping."""
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data: Mapping[str, V] | None = None) -> None:
+        self._data = dict(data or {})
+        self._hash: int | None = None
+
+    def __getitem__(self, key: str) -> V:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
 
+    def __repr__(self) -> str:
+        return f"FrozenMap({self._data!r})"
 
-@dataclass
+    def __getstate__(self) -> dict[str, V]:
+        return self._data
+
+    def __setstate__(self, state: dict[str, V]) -> None:
+        self._data = state
+        self._hash = None
+
+
+def _freeze(obj: object, *names: str) -> None:
+    for name in names:
+        value = getattr(obj, name)
+        if not isinstance(value, tuple):
+            object.__setattr__(obj, name, tuple(value))
+
+
+@dataclass(frozen=True, slots=True)
 class ProjectConfig:
     name: str = ""
     description: str = ""
-    languages: list[str] = field(default_factory=list)
-    frameworks: list[str] = field(default_factory=list)
+    languages: tuple[str, ...] = ()
+    frameworks: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        _freeze(self, "languages", "frameworks")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StyleConfig:
-    rules: list[str] = field(default_factory=list)
+    rules: tuple[str, ...] = ()
 
+    def __post_init__(self) -> None:
+        _freeze(self, "rules")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class CommandsConfig:
     build: str = ""
     test: str = ""
     lint: str = ""
     dev: str = ""
+    _as_dict: dict[str, str] = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        commands = {"build": self.build, "test": self.test, "lint": self.lint, "dev": self.dev}
+        object.__setattr__(self, "_as_dict", {k: v for k, v in commands.items() if v})
 
     def as_dict(self) -> dict[str, str]:
-        return {k: v for k, v in self.__dict__.items() if v}
+        """Non-empty commands by name. Built once; treat it as read-only."""
+        return self._as_dict
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ArchitectureConfig:
-    notes: list[str] = field(default_factory=list)
+    notes: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        _freeze(self, "notes")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TargetOverride:
-    extra_rules: list[str] = field(default_factory=list)
+    extra_rules: tuple[str, ...] = ()
     output_path: str = ""
+    max_tokens: int = 0  # 0 = no token budget
 
+    def __post_init__(self) -> None:
+        _freeze(self, "extra_rules")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class TargetsConfig:
-    enabled: list[str] = field(default_factory=lambda: ["claude-md", "cursorrules", "copilot"])
-    overrides: dict[str, TargetOverride] = field(default_factory=dict)
+    enabled: tuple[str, ...] = ("claude-md", "cursorrules", "copilot")
+    overrides: FrozenMap[TargetOverride] = field(default_factory=FrozenMap)
+
+    def __post_init__(self) -> None:
+        _freeze(self, "enabled")
+        if not isinstance(self.overrides, FrozenMap):
+            object.__setattr__(self, "overrides", FrozenMap(self.overrides))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AiRulesConfig:
     project: ProjectConfig = field(default_factory=ProjectConfig)
     style: StyleConfig = field(default_factory=StyleConfig)
@@ -1,5 +1,50 @@
-"""Auto-import all output adapters to trigger registration."""
+"""Built-in output adapters, described without importing them.
 
-from dotruler.outputs import aider, claude_md, codex, copilot, cursorrules, windsurf
+The registry imports an adapter module only when its renderer is requested.
+"""
 
-__all__ = ["aider", "claude_md", "codex", "copilot", "cursorrules", "windsurf"]
+from dotruler.registry import TargetSpec
+
+BUILTIN_TARGETS = (
+    TargetSpec(
+        "claude-md",
+        "dotruler.outputs.claude_md:ClaudeMdRenderer",
+        output_path="CLAUDE.md",
+        description="Claude Code project instructions",
+    ),
+    TargetSpec(
+        "cursorrules",
+        "dotruler.outputs.cursorrules:CursorRulesRenderer",
+        output_path=".cursorrules",
+        description="Cursor AI project rules",
+    ),
+    TargetSpec(
+        "copilot",
+        "dotruler.outputs.copilot:CopilotRenderer",
+        output_path=".github/copilot-instructions.md",
+        description="GitHub Copilot custom instructions",
+    ),
+    TargetSpec(
+        "windsurf",
+        "dotruler.outputs.windsurf:WindsurfRenderer",
+        output_path=".windsurfrules",
+        description="Windsurf Cascade project rules",
+        max_chars=12_000,
+    ),
+    TargetSpec(
+        "codex",
+        "dotruler.outputs.codex:CodexRenderer",
+        output_path="AGENTS.md",
+        description="OpenAI Codex agent instructions",
+        max_chars=32_768,
+        limit_unit="bytes",
+    ),
+    TargetSpec(
+        "aider",
+        "dotruler.outputs.aider:AiderRenderer",
+        output_path="CONVENTIONS.md",
+        description="Aider coding conventions",
+    ),
+)
+
+__all__ = ["BUILTIN_TARGETS"]
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
+from abc import ABC
+from collections.abc import Iterator
+from dataclasses import replace
 from pathlib import Path
 
+from dotruler.fileio import write_chunks_if_changed, write_if_changed
 from dotruler.models import AiRulesConfig, TargetOverride
+from dotruler.outputs.cache import render_cache, render_key
+from dotruler.outputs.document import Document
+from dotruler.outputs.packing import PackReport, measure, pack, truncate
+from dotruler.tokens import count_tokens
 
 
 class BaseRenderer(ABC):
@@ -15,6 +22,8 @@ class BaseRenderer(ABC):
     default_output_path: str = ""
     description: str = ""
     max_chars: int = 0  # 0 = no limit
+    limit_unit: str = "chars"  # what max_chars counts: "chars" or UTF-8 "bytes"
+    version: int = 1  # bump when output changes for the same config, to invalidate cached renders
 
     def get_output_path(self, override: TargetOverride | None = None) -> str:
         """Get the output path, respecting overrides."""
@@ -30,19 +39,208 @@ class BaseRenderer(ABC):
             rules.extend(override.extra_rules)
         return rules
 
-    @abstractmethod
     def render(self, config: AiRulesConfig) -> str:
-        """Render config into the target format string."""
+        """Render config into the target format string.
 
-    def write(self, config: AiRulesConfig, base_dir: Path) -> Path:
+        Renderers written against the original API override only this; they
+        are rendered from the config as is, and over-limit output is cut
+        rather than packed.
+        """
+        return self.render_document(Document.from_config(config))
+
+    def render_document(self, doc: Document) -> str:
+        """Render a prebuilt document into the target format string."""
+        return "".join(self.iter_chunks(doc))
+
+    def iter_sections(self, doc: Document) -> Iterator[str]:
+        """Yield the target's sections in order; they are joined by blank lines.
+
+        Renderers implement either this or ``render_document``. Implementing
+        this one lets large outputs be streamed to disk a section at a time.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must implement iter_sections or render_document")
+
+    def iter_chunks(self, doc: Document) -> Iterator[str]:
+        """Yield pieces of the output whose concatenation is ``render_document(doc)``."""
+        cls = type(self)
+        if cls.iter_sections is BaseRenderer.iter_sections:
+            if cls.render_document is BaseRenderer.render_document:
+                raise NotImplementedError(f"{cls.__name__} must implement iter_sections or render_document")
+            yield self.render_document(doc)
+            return
+        first = True
+        for section in self.iter_sections(doc):
+            if not first:
+                yield "\n\n"
+            first = False
+            yield section
+        yield "\n"
+
+    def limits(self, config: AiRulesConfig) -> list[tuple[int, str]]:
+        """Size limits for this target as ``(limit, unit)`` pairs.
+
+        ``max_chars`` (in ``limit_unit``) plus any ``max_tokens`` budget set
+        in the target's ``[targets.<id>]`` override.
+        """
+        limits = [(self.max_chars, self.limit_unit)] if self.max_chars else []
+        override = config.targets.overrides.get(self.target_id)
+        if override and override.max_tokens:
+            limits.append((override.max_tokens, "tokens"))
+        return limits
+
+    def fit(self, config: AiRulesConfig, doc: Document) -> tuple[Document, PackReport]:
+        """Pack ``doc`` into every limit of this target, dropping whole items by priority."""
+        dropped_rules: tuple[str, ...] = ()
+        dropped_notes: tuple[str, ...] = ()
+        truncated = False
+        for limit, unit in self.limits(config):
+            doc, report = pack(self, doc, limit, unit)
+            dropped_rules += report.dropped_rules
+            dropped_notes += report.dropped_notes
+            truncated = truncated or report.truncated
+        return doc, PackReport(dropped_rules, dropped_notes, truncated)
+
+    def stream(self, config: AiRulesConfig, document: Document | None = None) -> Iterator[str]:
+        """Like ``build`` but yields chunks, enforcing the size limits as it goes.
+
+        Nothing is cached and no chunk outlives the next one, so peak memory
+        is bounded by the largest section rather than the whole output.
+        """
+        if self._renders_config():
+            return iter((self.build(config),))
+        doc = document or Document.from_config(config)
+        limits = self.limits(config)
+        if limits:
+            doc, _ = self.fit(config, doc)
+        return self._stream_fitted(doc, limits)
+
+    def _renders_config(self) -> bool:
+        """Whether this renderer only overrides ``render(config)``."""
+        return type(self).render is not BaseRenderer.render
+
+    def _stream_fitted(self, doc: Document, limits: list[tuple[int, str]]) -> Iterator[str]:
+        """Yield ``doc``'s chunks cut to ``limits`` exactly as ``build`` cuts the whole text.
+
+        Trailing newlines of each chunk are held back until more text follows:
+        token truncation keeps whole lines and drops the newline before the
+        first line that doesn't fit, which may belong to an earlier chunk.
+        """
+        if not limits:
+            yield from self.iter_chunks(doc)
+            return
+        remaining = {unit: limit for limit, unit in limits}
+        pending = ""
+        for chunk in self.iter_chunks(doc):
+            text = pending + chunk
+            cut = text
+            for unit, left in remaining.items():
+                cut = truncate(cut, left, unit)
+            if cut != text:
+                if cut:
+                    yield cut
+                return
+            body = text.rstrip("\n")
+            pending = text[len(body):]
+            if body:
+                for unit in remaining:
+                    remaining[unit] -= measure(body, unit)
+                yield body
+        if pending:
+            yield pending
+
+    def build(self, config: AiRulesConfig, document: Document | None = None) -> str:
+        """Render config and apply the target's size limits.
+
+        Pass a ``document`` built once per config to share it across targets.
+        Output is memoized in ``render_cache`` by config fingerprint, target
+        and renderer ``version``, so an unchanged config isn't rendered twice.
+        """
+        return self.build_with_report(config, document)[0]
+
+    def build_with_report(
+        self, config: AiRulesConfig, document: Document | None = None
+    ) -> tuple[str, PackReport]:
+        """Like ``build``, also reporting estimated tokens and what was dropped to fit.
+
+        Output over a limit is packed (whole rules and notes dropped by
+        priority, see ``dotruler.outputs.packing``) rather than cut mid-rule.
+        """
+        key = render_key(self, config)
+        cached = render_cache.get(key)
+        if cached is not None:
+            content, report = cached
+            return content, PackReport(*report)
+
+        limits = self.limits(config)
+        report = PackReport()
+        if self._renders_config():
+            content = self.render(config)
+        else:
+            doc = document or Document.from_config(config)
+            content = self.render_document(doc)
+            if any(measure(content, unit) > limit for limit, unit in limits):
+                doc, report = self.fit(config, doc)
+                content = self.render_document(doc)
+
+        truncated = report.truncated
+        for limit, unit in limits:
+            if measure(content, unit) > limit:
+                content = truncate(content, limit, unit)
+                truncated = True
+        report = PackReport(report.dropped_rules, report.dropped_notes, truncated, count_tokens(content))
+
+        render_cache.put(key, (content, report.as_tuple()))
+        return content, report
+
+    def write(
+        self, config: AiRulesConfig, base_dir: Path, document: Document | None = None
+    ) -> Path:
         """Render and write to file. Returns the output path."""
+        output_path, _ = self.write_if_changed(config, base_dir, document)
+        return output_path
+
+    def write_if_changed(
+        self,
+        config: AiRulesConfig,
+        base_dir: Path,
+        document: Document | None = None,
+        stream: bool = False,
+    ) -> tuple[Path, bool]:
+        """Render and write unless the file already has this content.
+
+        Returns the output path and whether the file was written. Unchanged
+        files are left alone so their mtimes (and any watchers) stay quiet.
+        With ``stream``, sections are written to a temp file as they are
+        rendered and renamed into place, instead of building the whole string.
+        """
+        output_path, changed, _ = self.write_with_report(config, base_dir, document, stream)
+        return output_path, changed
+
+    def write_with_report(
+        self,
+        config: AiRulesConfig,
+        base_dir: Path,
+        document: Document | None = None,
+        stream: bool = False,
+    ) -> tuple[Path, bool, PackReport]:
+        """Like ``write_if_changed``, also returning the ``build_with_report`` report."""
         override = config.targets.overrides.get(self.target_id)
         output_path = base_dir / self.get_output_path(override)
-        content = self.render(config)
+        if stream and not self._renders_config():
+            doc = document or Document.from_config(config)
+            limits = self.limits(config)
+            report = PackReport()
+            if limits:
+                doc, report = self.fit(config, doc)
+            tokens = 0
 
-        if self.max_chars and len(content) > self.max_chars:
-            content = content[: self.max_chars]
+            def chunks() -> Iterator[bytes]:
+                nonlocal tokens
+                for chunk in self._stream_fitted(doc, limits):
+                    tokens += count_tokens(chunk)
+                    yield chunk.encode("utf-8")
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding="utf-8")
-        return output_path
+            changed = write_chunks_if_changed(output_path, chunks())
+            return output_path, changed, replace(report, tokens=tokens)
+        content, report = self.build_with_report(config, document)
+        return output_path, write_if_changed(output_path, content.encode("utf-8")), report
@@ -0,0 +1,118 @@
+"""LRU cache of rendered target output, keyed by config fingerprint."""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dotruler import __version__
+from dotruler.models import AiRulesConfig, FrozenMap
+from dotruler.state import cache_file, load_snapshot, save_snapshot
+from dotruler.tokens import tokenizer_name
+
+if TYPE_CHECKING:
+    from dotruler.outputs.base import BaseRenderer
+
+RENDER_CACHE_VERSION = 3
+RENDER_CACHE_NAME = "render.marshal"
+
+
+def _plain(value: object) -> object:
+    """Convert a model into nested tuples that marshal can serialize."""
+    if is_dataclass(value):
+        return tuple((f.name, _plain(getattr(value, f.name))) for f in fields(value) if f.compare)
+    if isinstance(value, FrozenMap):
+        return tuple(sorted((k, _plain(v)) for k, v in value.items()))
+    return value
+
+
+@lru_cache(maxsize=128)
+def config_fingerprint(config: AiRulesConfig) -> str:
+    """Stable hex digest of a config's contents, the same across runs."""
+    return hashlib.blake2b(marshal.dumps(_plain(config)), digest_size=16).hexdigest()
+
+
+def render_key(renderer: BaseRenderer, config: AiRulesConfig) -> str:
+    """Cache key for one target's output of ``config``."""
+    cls = type(renderer)
+    return (
+        f"{config_fingerprint(config)}:{renderer.target_id}:{cls.__module__}.{cls.__qualname__}"
+        f":{renderer.version}:{tokenizer_name()}"
+    )
+
+
+class RenderCache:
+    """Bounded LRU of rendered output, optionally persisted under .dotruler/.
+
+    Values are ``(content, pack report tuple)`` pairs.
+
+    Entries are only valid for the dotruler version that wrote them, so a
+    persisted cache is discarded after an upgrade.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: tuple) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self._dirty = False
+
+    def load(self, root: Path) -> None:
+        """Merge entries persisted for a project root, keeping newer in-memory ones."""
+        snapshot = load_snapshot(cache_file(root, RENDER_CACHE_NAME), RENDER_CACHE_VERSION)
+        if not isinstance(snapshot, tuple) or len(snapshot) != 2 or snapshot[0] != __version__:
+            return
+        with self._lock:
+            # Persisted entries keep their saved LRU order, older than anything in memory.
+            entries = OrderedDict((key, value) for key, value in snapshot[1] if key not in self._entries)
+            entries.update(self._entries)
+            self._entries = entries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self, root: Path) -> None:
+        """Persist entries for a project root if anything was added since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = list(self._entries.items())
+            self._dirty = False
+        save_snapshot(cache_file(root, RENDER_CACHE_NAME), RENDER_CACHE_VERSION, (__version__, entries))
+
+
+# Shared by every renderer in the process.
+render_cache = RenderCache()
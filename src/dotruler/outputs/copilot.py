@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from dotruler.models import AiRulesConfig
+from collections.abc import Iterator
+
 from dotruler.outputs.base import BaseRenderer
+from dotruler.outputs.document import Document
 from dotruler.registry import register
 
 
@@ -13,40 +15,33 @@ class CopilotRenderer(BaseRenderer):
     default_output_path = ".github/copilot-instructions.md"
     description = "GitHub Copilot custom instructions"
 
-    def render(self, config: AiRulesConfig) -> str:
-        sections: list[str] = []
-
+    def iter_sections(self, doc: Document) -> Iterator[str]:
         # Project context
-        if config.project.name:
-            header = f"# {config.project.name}"
-            if config.project.description:
-                header += f"\n\n{config.project.description}"
-            sections.append(header)
+        if doc.name:
+            header = f"# {doc.name}"
+            if doc.description:
+                header += f"\n\n{doc.description}"
+            yield header
 
         # Tech stack
         stack_parts: list[str] = []
-        if config.project.languages:
-            stack_parts.append(f"- **Languages:** {', '.join(config.project.languages)}")
-        if config.project.frameworks:
-            stack_parts.append(f"- **Frameworks:** {', '.join(config.project.frameworks)}")
+        if doc.languages:
+            stack_parts.append(f"- **Languages:** {doc.languages}")
+        if doc.frameworks:
+            stack_parts.append(f"- **Frameworks:** {doc.frameworks}")
         if stack_parts:
-            sections.append("## Tech Stack\n\n" + "\n".join(stack_parts))
+            yield "## Tech Stack\n\n" + "\n".join(stack_parts)
 
         # Rules
-        rules = self.get_all_rules(config)
-        if rules:
-            rule_lines = "\n".join(f"- {r}" for r in rules)
-            sections.append(f"## Code Style\n\n{rule_lines}")
+        rule_lines = doc.rule_lines_for(self.target_id)
+        if rule_lines:
+            yield f"## Code Style\n\n{rule_lines}"
 
         # Commands
-        commands = config.commands.as_dict()
-        if commands:
-            cmd_lines = "\n".join(f"- **{name}:** `{cmd}`" for name, cmd in commands.items())
-            sections.append(f"## Commands\n\n{cmd_lines}")
+        cmd_lines = doc.command_lines("- **{name}:** `{cmd}`")
+        if cmd_lines:
+            yield f"## Commands\n\n{cmd_lines}"
 
         # Architecture
-        if config.architecture.notes:
-            note_lines = "\n".join(f"- {n}" for n in config.architecture.notes)
-            sections.append(f"## Architecture\n\n{note_lines}")
-
-        return "\n\n".join(sections) + "\n"
+        if doc.note_lines:
+            yield f"## Architecture\n\n{doc.note_lines}"
@@ -0,0 +1,95 @@
+"""Target-independent document model shared by all renderers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from dotruler.models import AiRulesConfig
+
+
+def _bullets(items: tuple[str, ...]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+@dataclass
+class Document:
+    """Pre-formatted fragments of one config, built once and shared by every target.
+
+    Renderers are thin formatters over this: the joined stack strings and the
+    bullet lists for rules and notes are computed once per config, not once
+    per target.
+    """
+
+    name: str = ""
+    description: str = ""
+    languages: str = ""
+    frameworks: str = ""
+    rules: tuple[str, ...] = ()
+    commands: tuple[tuple[str, str], ...] = ()
+    notes: tuple[str, ...] = ()
+    extra_rules: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    rule_lines: str = ""
+    note_lines: str = ""
+    _rule_lines_by_target: dict[str, str] = field(default_factory=dict, repr=False)
+    _command_lines: dict[str, str] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_config(cls, config: AiRulesConfig) -> Document:
+        rules = tuple(config.style.rules)
+        notes = tuple(config.architecture.notes)
+        return cls(
+            name=config.project.name,
+            description=config.project.description,
+            languages=", ".join(config.project.languages),
+            frameworks=", ".join(config.project.frameworks),
+            rules=rules,
+            commands=tuple(config.commands.as_dict().items()),
+            notes=notes,
+            extra_rules={
+                target_id: tuple(override.extra_rules)
+                for target_id, override in config.targets.overrides.items()
+                if override.extra_rules
+            },
+            rule_lines=_bullets(rules),
+            note_lines=_bullets(notes),
+        )
+
+    def with_items(
+        self, rules: tuple[str, ...], notes: tuple[str, ...], extra_rules: dict[str, tuple[str, ...]]
+    ) -> Document:
+        """Copy with different rules and notes; used to fit a size limit."""
+        return Document(
+            name=self.name,
+            description=self.description,
+            languages=self.languages,
+            frameworks=self.frameworks,
+            rules=rules,
+            commands=self.commands,
+            notes=notes,
+            extra_rules={target_id: extra for target_id, extra in extra_rules.items() if extra},
+            rule_lines=_bullets(rules),
+            note_lines=_bullets(notes),
+        )
+
+    def rules_for(self, target_id: str) -> tuple[str, ...]:
+        """Base rules followed by the target's extra rules."""
+        return self.rules + self.extra_rules.get(target_id, ())
+
+    def rule_lines_for(self, target_id: str) -> str:
+        """Bullet list of ``rules_for(target_id)``, reusing the shared base bullets."""
+        extra = self.extra_rules.get(target_id)
+        if not extra:
+            return self.rule_lines
+        if target_id not in self._rule_lines_by_target:
+            parts = [self.rule_lines] if self.rule_lines else []
+            parts.append(_bullets(extra))
+            self._rule_lines_by_target[target_id] = "\n".join(parts)
+        return self._rule_lines_by_target[target_id]
+
+    def command_lines(self, template: str) -> str:
+        """Commands formatted one per line with ``template`` (``{name}``, ``{cmd}``)."""
+        if template not in self._command_lines:
+            self._command_lines[template] = "\n".join(
+                template.format(name=name, cmd=cmd) for name, cmd in self.commands
+            )
+        return self._command_lines[template]
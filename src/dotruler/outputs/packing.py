@@ -0,0 +1,119 @@
+"""Fit a document into a target's size limit by dropping whole rules and notes.
+
+Instead of cutting the rendered text at the limit, which can split a rule
+or silently lose a section, items are kept greedily in priority order:
+the target's own extra rules, then shared rules, then architecture notes,
+each in config order. An item that doesn't fit is dropped and smaller ones
+after it are still tried. Kept items are rendered in their original order.
+
+Item costs are additive, so packing is one pass over the items plus a few
+renders of tiny documents to learn each section's fixed overhead. Sizes
+are measured in characters, UTF-8 bytes or estimated tokens.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from dotruler.outputs.document import Document
+from dotruler.tokens import count_tokens, truncate_tokens
+
+if TYPE_CHECKING:
+    from dotruler.outputs.base import BaseRenderer
+
+
+@dataclass(frozen=True)
+class PackReport:
+    """What was left out to fit a target's limits. False when everything fit."""
+
+    dropped_rules: tuple[str, ...] = ()
+    dropped_notes: tuple[str, ...] = ()
+    truncated: bool = False  # fixed sections alone exceeded a limit and were cut
+    tokens: int = 0  # estimated tokens of the final output
+
+    def __bool__(self) -> bool:
+        return bool(self.dropped_rules or self.dropped_notes or self.truncated)
+
+    def summary(self) -> str:
+        parts = []
+        if self.dropped_rules:
+            parts.append(_plural(len(self.dropped_rules), "rule"))
+        if self.dropped_notes:
+            parts.append(_plural(len(self.dropped_notes), "note"))
+        text = f"dropped {' and '.join(parts)}" if parts else ""
+        if self.truncated:
+            text = f"{text}, truncated" if text else "truncated"
+        return text
+
+    def as_tuple(self) -> tuple:
+        return (self.dropped_rules, self.dropped_notes, self.truncated, self.tokens)
+
+
+def _plural(n: int, word: str) -> str:
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def measure(text: str, unit: str) -> int:
+    """Size of ``text`` in ``"chars"``, UTF-8 ``"bytes"`` or estimated ``"tokens"``."""
+    if unit == "bytes":
+        return len(text.encode("utf-8"))
+    if unit == "tokens":
+        return count_tokens(text)
+    return len(text)
+
+
+def truncate(text: str, limit: int, unit: str) -> str:
+    """Cut ``text`` to at most ``limit`` units without splitting a character (or, for tokens, a line)."""
+    if unit == "bytes":
+        return text.encode("utf-8")[:limit].decode("utf-8", errors="ignore")
+    if unit == "tokens":
+        return truncate_tokens(text, limit)
+    return text[:limit]
+
+
+def pack(renderer: BaseRenderer, doc: Document, limit: int, unit: str) -> tuple[Document, PackReport]:
+    """Return the largest priority-ordered subset of ``doc`` whose rendering fits ``limit`` units."""
+    target_id = renderer.target_id
+
+    def size(d: Document) -> int:
+        return measure(renderer.render_document(d), unit)
+
+    extra = doc.extra_rules.get(target_id, ())
+    empty = doc.with_items((), (), {})
+    used = size(empty)
+    if used > limit:
+        return empty, PackReport(dropped_rules=doc.rules + extra, dropped_notes=doc.notes, truncated=True)
+
+    # Fixed cost of a section (heading, separators) beyond its single bullet;
+    # each further bullet costs itself plus one line separator.
+    separator = measure("\n", unit)
+    overhead = {
+        "rules": size(doc.with_items(("x",), (), {})) - used - measure("- x", unit),
+        "notes": size(doc.with_items((), ("x",), {})) - used - measure("- x", unit),
+    }
+    candidates = [
+        *(("rules", ("extra", i), item) for i, item in enumerate(extra)),
+        *(("rules", ("base", i), item) for i, item in enumerate(doc.rules)),
+        *(("notes", ("notes", i), item) for i, item in enumerate(doc.notes)),
+    ]
+
+    kept: set[tuple[str, int]] = set()
+    opened: set[str] = set()
+    for section, key, item in candidates:
+        cost = measure(f"- {item}", unit) + (separator if section in opened else overhead[section])
+        if used + cost <= limit:
+            used += cost
+            kept.add(key)
+            opened.add(section)
+
+    def split(name: str, items: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        keep = tuple(item for i, item in enumerate(items) if (name, i) in kept)
+        drop = tuple(item for i, item in enumerate(items) if (name, i) not in kept)
+        return keep, drop
+
+    rules, dropped_rules = split("base", doc.rules)
+    extra_kept, dropped_extra = split("extra", extra)
+    notes, dropped_notes = split("notes", doc.notes)
+    packed = doc.with_items(rules, notes, {target_id: extra_kept})
+    return packed, PackReport(dropped_rules=dropped_extra + dropped_rules, dropped_notes=dropped_notes)
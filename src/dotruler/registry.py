@@ -1,13 +1,42 @@
-"""Plugin registry for output adapters."""
+"""Plugin registry for output adapters.
+
+Targets are described by lightweight ``TargetSpec`` descriptors; a renderer
+module is only imported when ``get_renderer`` asks for it. Built-in targets
+are listed in ``dotruler.outputs``, and third-party targets are discovered
+through the ``dotruler.targets`` entry point group. An entry point may
+reference either a ``TargetSpec`` (so listing never imports renderer code)
+or the renderer class itself.
+"""
 
 from __future__ import annotations
 
+import functools
+import importlib
+from dataclasses import dataclass, replace
+from importlib.metadata import entry_points
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from dotruler.outputs.base import BaseRenderer
 
+ENTRY_POINT_GROUP = "dotruler.targets"
+
+
+@dataclass(frozen=True)
+class TargetSpec:
+    """Descriptor for an output target. ``renderer`` is a ``"module:Class"`` reference."""
+
+    target_id: str
+    renderer: str
+    output_path: str = ""
+    description: str = ""
+    max_chars: int = 0
+    limit_unit: str = "chars"
+
+
+_SPECS: dict[str, TargetSpec] = {}
 _REGISTRY: dict[str, type[BaseRenderer]] = {}
+_builtins_loaded = False
 
 
 def register(target_id: str):
@@ -15,19 +44,91 @@ def register(target_id: str):
 
     def decorator(cls: type[BaseRenderer]) -> type[BaseRenderer]:
         _REGISTRY[target_id] = cls
+        _SPECS.setdefault(target_id, _spec_from_class(target_id, cls))
         return cls
 
     return decorator
 
 
 def get_renderer(target_id: str) -> type[BaseRenderer]:
-    """Get a renderer class by target ID."""
+    """Get a renderer class by target ID, importing its module on first use."""
     if target_id not in _REGISTRY:
-        available = ", ".join(sorted(_REGISTRY))
-        raise KeyError(f"Unknown target '{target_id}'. Available: {available}")
+        cls = _load_ref(get_spec(target_id).renderer)
+        _REGISTRY[target_id] = cls
     return _REGISTRY[target_id]
 
 
+def get_spec(target_id: str) -> TargetSpec:
+    """Get a target descriptor by ID without importing its renderer."""
+    _load_builtins()
+    if target_id in _SPECS:
+        return _SPECS[target_id]
+    if target_id in _entry_point_refs():
+        return _plugin_spec(target_id)
+    available = ", ".join(target_ids())
+    raise KeyError(f"Unknown target '{target_id}'. Available: {available}")
+
+
+def target_ids() -> list[str]:
+    """Return the IDs of all known targets. Imports nothing."""
+    _load_builtins()
+    return sorted({*_SPECS, *_entry_point_refs()})
+
+
+def list_specs() -> dict[str, TargetSpec]:
+    """Return descriptors for all known targets."""
+    return {target_id: get_spec(target_id) for target_id in target_ids()}
+
+
 def list_targets() -> dict[str, type[BaseRenderer]]:
-    """Return all registered targets."""
-    return dict(_REGISTRY)
+    """Return all targets with their renderer classes. Imports every renderer."""
+    return {target_id: get_renderer(target_id) for target_id in target_ids()}
+
+
+def _load_builtins() -> None:
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    from dotruler.outputs import BUILTIN_TARGETS
+
+    for spec in BUILTIN_TARGETS:
+        _SPECS.setdefault(spec.target_id, spec)
+    _builtins_loaded = True
+
+
+@functools.cache
+def _entry_point_refs() -> dict[str, str]:
+    """Map third-party target IDs to their entry point references (cached)."""
+    return {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def _plugin_spec(target_id: str) -> TargetSpec:
+    """Resolve an entry point to a spec, loading the referenced object."""
+    ref = _entry_point_refs()[target_id]
+    obj = _load_ref(ref)
+    if isinstance(obj, TargetSpec):
+        spec = replace(obj, target_id=target_id)
+    else:
+        _REGISTRY[target_id] = obj
+        spec = _spec_from_class(target_id, obj, ref)
+    _SPECS[target_id] = spec
+    return spec
+
+
+def _spec_from_class(target_id: str, cls: type[BaseRenderer], ref: str = "") -> TargetSpec:
+    return TargetSpec(
+        target_id=target_id,
+        renderer=ref or f"{cls.__module__}:{cls.__qualname__}",
+        output_path=cls.default_output_path,
+        description=cls.description,
+        max_chars=cls.max_chars,
+        limit_unit=cls.limit_unit,
+    )
+
+
+def _load_ref(ref: str):
+    module_name, _, attr = ref.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
@@ -3,7 +3,21 @@
 from __future__ import annotations
 
 import json
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
 from pathlib import Path
+from typing import NamedTuple
+
+from dotruler.ignore import GITIGNORE, IgnoreSource, ancestor_sources, matcher, signature
+from dotruler.state import (
+    RACY_WINDOW_NS,
+    STATE_DIRNAME,
+    cache_file,
+    load_snapshot,
+    save_snapshot,
+)
 
 # File extension → language mapping
 LANGUAGE_MAP: dict[str, str] = {
@@ -67,103 +81,229 @@ AI_CONFIG_FILES: dict[str, str] = {
     "CONVENTIONS.md": "aider",
 }
 
+# Manifest files that mark a directory as a (sub-)project
+MANIFEST_FILES = {
+    "package.json", "pyproject.toml", "setup.py", "Cargo.toml", "go.mod",
+    "Gemfile", "pubspec.yaml", "Package.swift", "build.gradle", "pom.xml",
+    "composer.json",
+}
+
 SKIP_DIRS = {
     ".git", "node_modules", ".venv", "venv", "__pycache__",
     "build", "dist", ".next", ".nuxt", "target", ".tox",
-    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", STATE_DIRNAME,
 }
 
+# Bump when the cached per-directory record format or detection rules change.
+SCAN_CACHE_VERSION = 5
+SCAN_CACHE_NAME = "scan.marshal"
 
-def scan_languages(project_dir: Path, max_depth: int = 3) -> list[str]:
-    """Detect languages from file extensions."""
-    found: set[str] = set()
+SCAN_MAX_DEPTH = 12
+# Seconds scan_project spends listing directories before settling for what it has.
+SCAN_TIME_BUDGET = 5.0
+# A language is reported if it has at least this share of the scanned files or bytes.
+MIN_LANGUAGE_SHARE = 0.02
 
-    for path in _walk(project_dir, max_depth):
-        lang = LANGUAGE_MAP.get(path.suffix.lower())
-        if lang:
-            found.add(lang)
 
-    return sorted(found)
+class LanguageStats(NamedTuple):
+    files: int
+    bytes: int
 
 
-def scan_frameworks(project_dir: Path) -> list[str]:
-    """Detect frameworks from config files."""
-    found: set[str] = set()
+class _DirRecord(NamedTuple):
+    """What one directory listing contributes to a scan."""
 
-    for filename, framework in FRAMEWORK_SIGNALS.items():
-        if (project_dir / filename).exists():
-            found.add(framework)
+    mtime_ns: int
+    languages: dict[str, tuple[int, int]]  # language → (files, bytes)
+    subdirs: tuple[str, ...]
+    names: tuple[str, ...]  # all entry names; only kept for the root
+    gitignore: tuple[int, int, int] | None  # signature of the directory's own .gitignore
+    ignore_key: tuple  # the .gitignore files the listing was filtered with
 
-    # Check package.json for additional signals
-    pkg_json = project_dir / "package.json"
-    if pkg_json.exists():
-        try:
-            pkg = json.loads(pkg_json.read_text(encoding="utf-8"))
-            all_deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-            if "react" in all_deps:
-                found.add("react")
-            if "vue" in all_deps:
-                found.add("vue")
-            if "express" in all_deps:
-                found.add("express")
-            if "fastify" in all_deps:
-                found.add("fastify")
-        except (json.JSONDecodeError, OSError):
-            pass
 
-    # Check pyproject.toml for Python frameworks
-    pyproject = project_dir / "pyproject.toml"
-    if pyproject.exists():
+class ProjectIndex:
+    """Shared, lazily-filled view of a project directory for the detectors.
+
+    The root listing and each manifest are read at most once, so running all
+    detectors through one index costs one tree walk plus one read per
+    manifest.
+    """
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project_dir = project_dir
+        self._names: set[str] | None = None
+        self._manifests: dict[str, dict] = {}
+        self.complete = True  # False if the last language scan ran out of time
+
+    @property
+    def names(self) -> set[str]:
+        """Names of all entries directly under the project directory."""
+        if self._names is None:
+            try:
+                with os.scandir(self.project_dir) as entries:
+                    self._names = {entry.name for entry in entries}
+            except OSError:
+                self._names = set()
+        return self._names
+
+    def language_stats(
+        self, max_depth: int, use_cache: bool = False, time_budget: float | None = None
+    ) -> dict[str, LanguageStats]:
+        """Count files and bytes per language in one walk, recording the root listing.
+
+        With ``use_cache``, per-directory results are loaded from and saved to
+        ``.dotruler/cache``; directories whose mtime is unchanged are not
+        listed again. With ``time_budget`` (seconds), the walk stops listing
+        directories once it's spent; as it goes breadth-first, what's left out
+        are the deepest levels, and ``complete`` is set to False.
+        """
+        path = cache_file(self.project_dir, SCAN_CACHE_NAME)
+        snapshot = load_snapshot(path, SCAN_CACHE_VERSION) if use_cache else None
+        if snapshot:
+            saved_ns, raw = snapshot
+            cache = {rel: _DirRecord(*record) for rel, record in raw.items()}
+            trusted_before = saved_ns - RACY_WINDOW_NS
+        else:
+            cache, trusted_before = ({} if use_cache else None), 0
+
+        started_ns = time.time_ns()
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        records: dict[str, _DirRecord] = {}
+        files: dict[str, int] = {}
+        sizes: dict[str, int] = {}
+        self.complete = True
+        for rel, record in _walk(self.project_dir, max_depth, cache, trusted_before):
+            records[rel] = record
+            for lang, (count, size) in record.languages.items():
+                files[lang] = files.get(lang, 0) + count
+                sizes[lang] = sizes.get(lang, 0) + size
+            if deadline is not None and time.monotonic() > deadline:
+                self.complete = False
+                break
+
+        if self._names is None and "" in records:
+            self._names = set(records[""].names)
+        if use_cache:
+            raw = {rel: tuple(record) for rel, record in records.items()}
+            save_snapshot(path, SCAN_CACHE_VERSION, (started_ns, raw))
+        return {lang: LanguageStats(files[lang], sizes[lang]) for lang in files}
+
+    def has(self, rel_path: str) -> bool:
+        """Check for a file relative to the root, using the root listing first."""
+        first, _, rest = rel_path.partition("/")
+        if first not in self.names:
+            return False
+        return not rest or (self.project_dir / rel_path).exists()
+
+    def manifest(self, filename: str) -> dict:
+        """Parse a JSON or TOML manifest once. Missing or invalid → ``{}``."""
+        if filename not in self._manifests:
+            self._manifests[filename] = self._parse_manifest(filename)
+        return self._manifests[filename]
+
+    def _parse_manifest(self, filename: str) -> dict:
+        if filename not in self.names:
+            return {}
+        path = self.project_dir / filename
         try:
-            import tomllib
-
-            data = tomllib.loads(pyproject.read_text(encoding="utf-8"))
-            deps = data.get("project", {}).get("dependencies", [])
-            dep_str = " ".join(deps).lower()
-            if "fastapi" in dep_str:
-                found.add("fastapi")
-            if "flask" in dep_str:
-                found.add("flask")
-            if "django" in dep_str:
-                found.add("django")
+            if filename.endswith(".toml"):
+                import tomllib
+
+                with open(path, "rb") as f:
+                    return tomllib.load(f)
+            data = json.loads(path.read_text(encoding="utf-8"))
         except (ValueError, OSError):
-            pass
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def significant_languages(
+    stats: dict[str, LanguageStats], min_share: float = MIN_LANGUAGE_SHARE
+) -> list[str]:
+    """Languages with at least ``min_share`` of all files or of all bytes, sorted."""
+    total_files = sum(s.files for s in stats.values()) or 1
+    total_bytes = sum(s.bytes for s in stats.values()) or 1
+    return sorted(
+        lang
+        for lang, s in stats.items()
+        if s.files / total_files >= min_share or s.bytes / total_bytes >= min_share
+    )
+
+
+def scan_languages(
+    project_dir: Path,
+    max_depth: int = SCAN_MAX_DEPTH,
+    index: ProjectIndex | None = None,
+    use_cache: bool = False,
+    min_share: float = MIN_LANGUAGE_SHARE,
+    time_budget: float | None = None,
+) -> list[str]:
+    """Detect languages from file extensions, ignoring ones below ``min_share`` of the code."""
+    index = index or ProjectIndex(project_dir)
+    stats = index.language_stats(max_depth, use_cache=use_cache, time_budget=time_budget)
+    return significant_languages(stats, min_share)
+
+
+def scan_frameworks(project_dir: Path, index: ProjectIndex | None = None) -> list[str]:
+    """Detect frameworks from config files."""
+    index = index or ProjectIndex(project_dir)
+    found = {FRAMEWORK_SIGNALS[name] for name in index.names & FRAMEWORK_SIGNALS.keys()}
+
+    # Check package.json for additional signals
+    pkg = index.manifest("package.json")
+    if pkg:
+        all_deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+        if "react" in all_deps:
+            found.add("react")
+        if "vue" in all_deps:
+            found.add("vue")
+        if "express" in all_deps:
+            found.add("express")
+        if "fastify" in all_deps:
+            found.add("fastify")
+
+    # Check pyproject.toml for Python frameworks
+    data = index.manifest("pyproject.toml")
+    if data:
+        deps = data.get("project", {}).get("dependencies", [])
+        dep_str = " ".join(deps).lower()
+        if "fastapi" in dep_str:
+            found.add("fastapi")
+        if "flask" in dep_str:
+            found.add("flask")
+        if "django" in dep_str:
+            found.add("django")
 
     return sorted(found)
 
 
-def scan_commands(project_dir: Path) -> dict[str, str]:
+def scan_commands(project_dir: Path, index: ProjectIndex | None = None) -> dict[str, str]:
     """Detect common commands from project config files."""
+    index = index or ProjectIndex(project_dir)
     commands: dict[str, str] = {}
 
     # Check package.json scripts
-    pkg_json = project_dir / "package.json"
-    if pkg_json.exists():
-        try:
-            pkg = json.loads(pkg_json.read_text(encoding="utf-8"))
-            scripts = pkg.get("scripts", {})
-            if "build" in scripts:
-                commands["build"] = f"npm run build"
-            if "test" in scripts:
-                commands["test"] = f"npm test"
-            if "lint" in scripts:
-                commands["lint"] = f"npm run lint"
-            if "dev" in scripts:
-                commands["dev"] = f"npm run dev"
-            elif "start" in scripts:
-                commands["dev"] = f"npm start"
-        except (json.JSONDecodeError, OSError):
-            pass
+    scripts = index.manifest("package.json").get("scripts", {})
+    if "build" in scripts:
+        commands["build"] = f"npm run build"
+    if "test" in scripts:
+        commands["test"] = f"npm test"
+    if "lint" in scripts:
+        commands["lint"] = f"npm run lint"
+    if "dev" in scripts:
+        commands["dev"] = f"npm run dev"
+    elif "start" in scripts:
+        commands["dev"] = f"npm start"
 
     # Check for Makefile
-    if (project_dir / "Makefile").exists():
+    if "Makefile" in index.names:
         if "build" not in commands:
             commands["build"] = "make build"
         if "test" not in commands:
             commands["test"] = "make test"
 
     # Check for Python test tools
-    if (project_dir / "pyproject.toml").exists() or (project_dir / "setup.py").exists():
+    if "pyproject.toml" in index.names or "setup.py" in index.names:
         if "test" not in commands:
             commands["test"] = "pytest"
         if "lint" not in commands:
@@ -172,35 +312,186 @@ def scan_commands(project_dir: Path) -> dict[str, str]:
     return commands
 
 
-def scan_existing_ai_configs(project_dir: Path) -> dict[str, Path]:
+def scan_existing_ai_configs(
+    project_dir: Path, index: ProjectIndex | None = None
+) -> dict[str, Path]:
     """Find existing AI config files."""
+    index = index or ProjectIndex(project_dir)
     found: dict[str, Path] = {}
     for rel_path, target_id in AI_CONFIG_FILES.items():
-        full_path = project_dir / rel_path
-        if full_path.exists():
-            found[target_id] = full_path
+        if index.has(rel_path):
+            found[target_id] = project_dir / rel_path
     return found
 
 
-def scan_project(project_dir: Path) -> dict:
-    """Full project scan. Returns dict ready for TOML generation."""
+def scan_project(
+    project_dir: Path, use_cache: bool = False, time_budget: float | None = SCAN_TIME_BUDGET
+) -> dict:
+    """Full project scan. Returns dict ready for TOML generation.
+
+    All detectors share one ``ProjectIndex``: the language walk records the
+    root listing, and the framework/command detectors reuse parsed manifests.
+    With ``use_cache``, unchanged directories are served from the scan cache.
+    ``language_stats`` holds the files and bytes of every language seen, and
+    ``complete`` is False if the walk hit ``time_budget``.
+    """
+    index = ProjectIndex(project_dir)
+    stats = index.language_stats(SCAN_MAX_DEPTH, use_cache=use_cache, time_budget=time_budget)
     return {
-        "languages": scan_languages(project_dir),
-        "frameworks": scan_frameworks(project_dir),
-        "commands": scan_commands(project_dir),
-        "existing_ai_configs": scan_existing_ai_configs(project_dir),
+        "languages": significant_languages(stats),
+        "language_stats": stats,
+        "complete": index.complete,
+        "frameworks": scan_frameworks(project_dir, index=index),
+        "commands": scan_commands(project_dir, index=index),
+        "existing_ai_configs": scan_existing_ai_configs(project_dir, index=index),
     }
 
 
-def _walk(directory: Path, max_depth: int, _depth: int = 0):
-    """Walk directory tree with depth limit, skipping common build dirs."""
-    if _depth > max_depth:
-        return
+def find_subprojects(root: Path, max_depth: int = 4) -> list[Path]:
+    """Find directories under root (including root) that contain a manifest file."""
+    projects: list[Path] = []
+    stack: list[tuple[str, int]] = [(os.fspath(root), 0)]
+    while stack:
+        path, depth = stack.pop()
+        subdirs: list[str] = []
+        is_project = False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name in MANIFEST_FILES:
+                        is_project = True
+                    elif (
+                        depth < max_depth
+                        and entry.name not in SKIP_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        if is_project:
+            projects.append(Path(path))
+        stack.extend((subdir, depth + 1) for subdir in subdirs)
+    return sorted(projects)
+
+
+def _walk(
+    directory: Path,
+    max_depth: int,
+    cache: dict[str, _DirRecord] | None = None,
+    trusted_before: int = 0,
+) -> Iterator[tuple[str, _DirRecord]]:
+    """Walk directory tree breadth-first with depth limit, skipping common build dirs
+    and anything ignored by a ``.gitignore`` in the tree or above it, up to the
+    git work-tree root.
+
+    Yields ``(relative_dir, record)`` for every directory visited, shallowest
+    first, so a caller that stops early has covered the top of the tree.
+    Listings use ``os.scandir`` so file/dir checks come from the cached
+    ``DirEntry`` type info, and skipped or ignored directories are pruned
+    before they are listed.
+
+    If ``cache`` is given (even empty), each directory is stat'ed and a cached
+    record with the same mtime is reused instead of listing the directory,
+    as long as it was filtered with the same ``.gitignore`` files. File counts
+    are exact, but editing a file in place doesn't change its directory's
+    mtime, so a cached directory's byte totals can lag until it next changes;
+    re-stat'ing every source file would cost as much as listing it.
+    """
+    root = os.fspath(directory)
+    inherited = ancestor_sources(root)
+    if any(sig[0] >= trusted_before for _, _, sig in inherited):
+        trusted_before = 0  # edited too recently for its signature to be trusted
+    queue: deque[tuple[str, str, int, tuple[IgnoreSource, ...]]] = deque([("", root, 0, inherited)])
+    while queue:
+        rel, path, depth, sources = queue.popleft()
+        record = None
+        mtime_ns = 0
+        if cache is not None:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = cache.get(rel)
+            if cached and cached.mtime_ns == mtime_ns and mtime_ns < trusted_before:
+                if _ignore_unchanged(rel, path, sources, cached, trusted_before):
+                    record = cached
+        if record is None:
+            record = _scan_dir(path, rel, mtime_ns, sources)
+            if record is None:
+                continue
+
+        yield rel, record
+        if depth < max_depth:
+            if record.gitignore:
+                sources = (*sources, (rel, os.path.join(path, GITIGNORE), record.gitignore))
+            for name in record.subdirs:
+                queue.append((f"{rel}/{name}" if rel else name, os.path.join(path, name), depth + 1, sources))
+
+
+def _ignore_key(sources: tuple[IgnoreSource, ...]) -> tuple:
+    return tuple((base, sig) for base, _, sig in sources)
+
+
+def _ignore_unchanged(
+    rel: str, path: str, sources: tuple[IgnoreSource, ...], cached: _DirRecord, trusted_before: int
+) -> bool:
+    """Whether the ``.gitignore`` files that apply to a cached directory are the ones it was listed with.
+
+    The directory's mtime is unchanged, so its own ``.gitignore`` wasn't added
+    or removed; if it has one, it's stat'ed in case it was edited in place.
+    """
+    if cached.gitignore is not None:
+        try:
+            sig = signature(os.stat(os.path.join(path, GITIGNORE)))
+        except OSError:
+            return False
+        if sig != cached.gitignore or sig[0] >= trusted_before:
+            return False
+        sources = (*sources, (rel, os.path.join(path, GITIGNORE), sig))
+    return cached.ignore_key == _ignore_key(sources)
+
+
+def _scan_dir(
+    path: str, rel: str, mtime_ns: int, sources: tuple[IgnoreSource, ...] = ()
+) -> _DirRecord | None:
+    """List one directory into a record. Returns None if it can't be listed.
+
+    Entries matched by ``sources`` or the directory's own ``.gitignore`` are
+    left out. Only files with a known extension are stat'ed, for their size.
+    """
+    languages: dict[str, tuple[int, int]] = {}
+    subdirs: list[str] = []
+    names: list[str] = []
+    gitignore = None
     try:
-        for item in directory.iterdir():
-            if item.is_file():
-                yield item
-            elif item.is_dir() and item.name not in SKIP_DIRS:
-                yield from _walk(item, max_depth, _depth + 1)
-    except PermissionError:
-        pass
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return None
+    for entry in entries:
+        if entry.name == GITIGNORE:
+            try:
+                if entry.is_file():
+                    gitignore = signature(entry.stat())
+                    sources = (*sources, (rel, entry.path, gitignore))
+            except OSError:
+                pass
+            break
+
+    ignore = matcher(sources)
+    prefix = f"{rel}/" if rel else ""
+    for entry in entries:
+        if not rel:
+            names.append(entry.name)
+        try:
+            if entry.is_file():
+                lang = LANGUAGE_MAP.get(os.path.splitext(entry.name)[1].lower())
+                if lang and not (ignore and ignore.ignored(prefix + entry.name, False)):
+                    files, size = languages.get(lang, (0, 0))
+                    languages[lang] = (files + 1, size + entry.stat().st_size)
+            elif entry.name not in SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                if not (ignore and ignore.ignored(prefix + entry.name, True)):
+                    subdirs.append(entry.name)
+        except OSError:
+            continue
+    return _DirRecord(mtime_ns, languages, tuple(subdirs), tuple(names), gitignore, _ignore_key(sources))
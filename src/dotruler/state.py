@@ -0,0 +1,133 @@
+"""Per-project state kept under .dotruler/ (caches and snapshots)."""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+STATE_DIRNAME = ".dotruler"
+LOCK_NAME = "lock"
+
+# Files modified this close to the time their cache entry was made may change
+# again within the same mtime tick, so such entries are not trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+# Set to False (``dotruler --no-cache``) to neither read nor write snapshots.
+enabled = True
+
+
+def state_dir(root: Path) -> Path:
+    """Return the state directory for a project root."""
+    return root / STATE_DIRNAME
+
+
+def cache_file(root: Path, name: str) -> Path:
+    """Return the path of a named cache file for a project root."""
+    return state_dir(root) / "cache" / name
+
+
+def load_snapshot(path: Path, version: int) -> Any | None:
+    """Load a marshal snapshot written by ``save_snapshot``.
+
+    Returns None if the file is missing, unreadable, or was written by a
+    different snapshot version or Python version.
+    """
+    if not enabled:
+        return None
+    try:
+        with open(path, "rb") as f:
+            envelope = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if (
+        not isinstance(envelope, tuple)
+        or len(envelope) != 3
+        or envelope[:2] != (version, sys.implementation.cache_tag)
+    ):
+        return None
+    return envelope[2]
+
+
+def save_snapshot(path: Path, version: int, data: Any) -> None:
+    """Atomically write a marshal snapshot. Failures are ignored — caches are best-effort."""
+    if not enabled:
+        return
+    import tempfile
+
+    try:
+        _ensure_state_dir(path)
+        payload = marshal.dumps((version, sys.implementation.cache_tag, data))
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except (OSError, ValueError):
+        pass
+
+
+@contextmanager
+def project_lock(root: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a project's state while writing outputs.
+
+    Concurrent ``dotruler generate`` runs against one checkout (CI jobs,
+    pre-commit hooks) wait for each other instead of interleaving writes.
+    The OS releases the lock if the process dies. If the state dir can't be
+    created, e.g. on a read-only checkout, the block runs unlocked.
+    """
+    path = state_dir(root) / LOCK_NAME
+    try:
+        _ensure_state_dir(path)
+        f = open(path, "a+b")
+    except OSError:
+        yield
+        return
+    with f:
+        _lock(f.fileno())
+        try:
+            yield
+        finally:
+            _unlock(f.fileno())
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(fd: int) -> None:
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                continue
+
+    def _unlock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _ensure_state_dir(path: Path) -> None:
+    """Create the parent dirs of a state file, keeping .dotruler/ out of git."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for parent in path.parents:
+        if parent.name == STATE_DIRNAME:
+            gitignore = parent / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("*\n", encoding="utf-8")
+            break
@@ -0,0 +1,86 @@
+"""Offline token estimates for rendered targets.
+
+Counts are estimates of how much of a model's context window a generated
+file will use. The default ``heuristic`` tokenizer needs nothing beyond the
+standard library; ``tiktoken`` is used if selected and installed (its
+encodings must already be cached for it to work offline).
+
+Text is counted line by line and each line's count is memoized, so
+re-measuring a large rule set after a small edit only tokenizes the lines
+that changed.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from functools import lru_cache
+
+DEFAULT_TOKENIZER = "heuristic"
+
+# ASCII words, short digit groups, or any other single visible character.
+_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\S")
+
+
+def _heuristic(line: str) -> int:
+    """Approximate BPE tokens: common words are one token, long ones split every ~10 letters."""
+    count = 0
+    for piece in _PIECE_RE.findall(line):
+        count += 1 + (len(piece) - 1) // 10 if piece[0].isascii() and piece[0].isalpha() else 1
+    return count
+
+
+def _tiktoken() -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError:
+        raise ValueError("tokenizer 'tiktoken' needs the tiktoken package (pip install tiktoken)") from None
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda line: len(encoding.encode(line, disallowed_special=()))
+
+
+_FACTORIES: dict[str, Callable[[], Callable[[str], int]]] = {
+    "heuristic": lambda: _heuristic,
+    "tiktoken": _tiktoken,
+}
+
+_name = DEFAULT_TOKENIZER
+_count_line = lru_cache(maxsize=1 << 16)(_heuristic)
+
+
+def tokenizer_names() -> list[str]:
+    return sorted(_FACTORIES)
+
+
+def tokenizer_name() -> str:
+    """Name of the tokenizer in use."""
+    return _name
+
+
+def set_tokenizer(name: str) -> None:
+    """Select the tokenizer used by ``count_tokens``. Raises ValueError if unavailable."""
+    global _name, _count_line
+    if name == _name:
+        return
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown tokenizer '{name}'. Available: {', '.join(tokenizer_names())}")
+    _count_line = lru_cache(maxsize=1 << 16)(_FACTORIES[name]())
+    _name = name
+
+
+def count_tokens(text: str) -> int:
+    """Estimated tokens in ``text``; newlines themselves are not counted."""
+    count_line = _count_line
+    return sum(count_line(line) for line in text.split("\n") if line)
+
+
+def truncate_tokens(text: str, limit: int) -> str:
+    """Keep whole lines of ``text`` while they fit within ``limit`` tokens."""
+    kept: list[str] = []
+    used = 0
+    for line in text.split("\n"):
+        used += _count_line(line) if line else 0
+        if used > limit:
+            break
+        kept.append(line)
+    return "\n".join(kept)
@@ -0,0 +1,118 @@
+"""Polling watcher that regenerates targets when .dotruler.toml changes."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from dotruler.config import config_sources, load_config
+from dotruler.fileio import write_if_changed
+from dotruler.models import AiRulesConfig
+from dotruler.outputs.base import BaseRenderer
+from dotruler.outputs.document import Document
+from dotruler.registry import get_renderer
+from dotruler.state import project_lock
+
+
+class ConfigWatcher:
+    """Keep a config and its renderers warm and regenerate only what changed.
+
+    The config file, and any file it ``extends``, is polled with ``stat``. A change is acted on once the
+    file has stayed the same for ``debounce`` seconds, so a burst of saves
+    triggers a single regeneration. Each target's last output is kept in
+    memory, and a target is only written when its output differs.
+    """
+
+    def __init__(self, config_path: Path, project_dir: Path, debounce: float = 0.3) -> None:
+        self.config_path = config_path
+        self.project_dir = project_dir
+        self.debounce = debounce
+        self._sources: list[Path] = [config_path]
+        self._seen: tuple | None = None
+        self._changed_at: float | None = None
+        self._renderers: dict[str, BaseRenderer] = {}
+        self._outputs: dict[str, tuple[Path, str]] = {}
+
+    def _signature(self) -> tuple:
+        signature = []
+        for source in self._sources:
+            try:
+                st = os.stat(source)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def step(self, now: float) -> list[tuple[str, str]] | None:
+        """Poll once. Returns regeneration results once a change has settled."""
+        signature = self._signature()
+        if signature != self._seen:
+            self._seen = signature
+            self._changed_at = now
+            return None
+        if self._changed_at is not None and now - self._changed_at >= self.debounce:
+            self._changed_at = None
+            return self.regenerate()
+        return None
+
+    def regenerate(self) -> list[tuple[str, str]]:
+        """Reload the config and write targets whose output changed.
+
+        Returns (status, detail) pairs: ``written``, ``unchanged``, ``skipped``
+        for unknown targets, or a single ``error`` if the config can't be loaded.
+        """
+        try:
+            config = load_config(self.config_path)
+            self._sources = config_sources(self.config_path)
+        except (OSError, ValueError) as e:
+            self._seen = self._signature()
+            return [("error", f"{self.config_path.name}: {e}")]
+        self._seen = self._signature()
+
+        with project_lock(self.project_dir):
+            return self._write_targets(config)
+
+    def _write_targets(self, config: AiRulesConfig) -> list[tuple[str, str]]:
+        document = Document.from_config(config)
+        results: list[tuple[str, str]] = []
+        for target_id in config.targets.enabled:
+            renderer = self._renderers.get(target_id)
+            if renderer is None:
+                try:
+                    renderer = self._renderers[target_id] = get_renderer(target_id)()
+                except KeyError as e:
+                    results.append(("skipped", str(e)))
+                    continue
+
+            override = config.targets.overrides.get(target_id)
+            path = self.project_dir / renderer.get_output_path(override)
+            content = renderer.build(config, document)
+            rel = str(path.relative_to(self.project_dir))
+
+            if self._outputs.get(target_id) == (path, content) and path.exists():
+                results.append(("unchanged", rel))
+                continue
+            changed = write_if_changed(path, content.encode("utf-8"))
+            self._outputs[target_id] = (path, content)
+            results.append(("written" if changed else "unchanged", rel))
+
+        for target_id in set(self._outputs) - set(config.targets.enabled):
+            del self._outputs[target_id]
+        return results
+
+    def run(
+        self,
+        on_results: Callable[[list[tuple[str, str]]], None],
+        interval: float = 0.5,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """Regenerate once, then poll every ``interval`` seconds until stopped."""
+        on_results(self.regenerate())
+        while not should_stop():
+            time.sleep(interval)
+            results = self.step(time.monotonic())
+            if results is not None:
+                on_results(results)
@@ -1,5 +1,7 @@
 """Tests for the CLI commands."""
 
+import subprocess
+import sys
 from pathlib import Path
 
 from typer.testing import CliRunner
@@ -21,6 +23,22 @@ def test_version():
     assert "0.1.0" in result.output
 
 
+def test_plain_output_has_no_markup():
+    result = runner.invoke(app, ["--plain", "list"])
+    assert result.exit_code == 0
+    assert "claude-md\tCLAUDE.md" in result.output
+    assert "[bold" not in result.output
+
+
+def test_import_does_not_load_rich_or_renderers():
+    code = (
+        "import sys, dotruler.cli; "
+        "print(any(m.startswith(('rich', 'dotruler.outputs')) for m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "False"
+
+
 def test_list():
     result = runner.invoke(app, ["list"])
     assert result.exit_code == 0
@@ -48,6 +66,85 @@ def test_init_force_overwrite(tmp_path):
     assert result.exit_code == 0
 
 
+def test_init_recursive(tmp_path):
+    for name in ("packages/web", "services/api"):
+        (tmp_path / name).mkdir(parents=True)
+    (tmp_path / "packages" / "web" / "package.json").write_text('{"scripts": {"build": "x"}}')
+    (tmp_path / "services" / "api" / "pyproject.toml").write_text("[project]\nname = 'api'\n")
+    (tmp_path / "services" / "api" / ".dotruler.toml").write_text("[project]\nname = 'x'\n")
+
+    result = runner.invoke(app, ["init", str(tmp_path), "--recursive", "--workers", "2"])
+    assert result.exit_code == 0
+    assert (tmp_path / "packages" / "web" / ".dotruler.toml").exists()
+    assert "name = 'x'" in (tmp_path / "services" / "api" / ".dotruler.toml").read_text()
+    assert "1 of 2 configs created" in result.output
+
+
+def test_init_recursive_no_projects(tmp_path):
+    result = runner.invoke(app, ["init", str(tmp_path), "--recursive"])
+    assert result.exit_code == 1
+
+
+def test_generate_reports_bad_extends(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text('extends = "missing.toml"\n')
+    result = runner.invoke(app, ["generate", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")])
+    assert result.exit_code == 1
+    assert "Could not load" in result.output
+
+
+def test_cache_stats(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "stats"\n[style]\nrules = ["Cache me"]\n[targets]\nenabled = ["claude-md"]\n'
+    )
+    args = ["--cache-stats", "generate", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")]
+    runner.invoke(app, args)
+    (tmp_path / ".dotruler.lock").unlink()  # otherwise the lock proves CLAUDE.md current without rendering
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert "render cache: 1 hits, 0 misses" in result.output
+
+
+def test_diff_lists_dropped_rules(tmp_path):
+    rules = ", ".join(f'"Rule number {i}"' for i in range(1000))
+    (tmp_path / ".dotruler.toml").write_text(
+        f'[project]\nname = "big"\n[style]\nrules = [{rules}]\n[targets]\nenabled = ["windsurf"]\n'
+    )
+    result = runner.invoke(app, ["--plain", "diff", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")])
+    assert result.exit_code == 0
+    assert "packed .windsurfrules: dropped" in result.output
+    assert "- Rule number 999" in result.output
+
+
+def test_diff_stat(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "stat"\n[style]\nrules = ["One"]\n[targets]\nenabled = ["claude-md", "aider"]\n'
+    )
+    args = ["--plain", "diff", "--stat", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml")]
+    runner.invoke(app, ["generate", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml")])
+    (tmp_path / "CLAUDE.md").write_text((tmp_path / "CLAUDE.md").read_text().replace("- One", "- Two\n- Three"))
+
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert result.output.splitlines() == [
+        " CLAUDE.md |     3 +--",
+        " 1 file changed, 1 insertions(+), 2 deletions(-)",
+    ]
+
+
+def test_token_usage_is_shown(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "tok"\n[style]\nrules = ["Keep it short"]\n'
+        '[targets]\nenabled = ["claude-md"]\n[targets.claude-md]\nmax_tokens = 1000\n'
+    )
+    config = str(tmp_path / ".dotruler.toml")
+    result = runner.invoke(app, ["--plain", "generate", str(tmp_path), "--config", config])
+    assert "CLAUDE.md (" in result.output and " tokens)" in result.output
+
+    result = runner.invoke(app, ["--plain", "list", "--tokens", "--config", config])
+    row = next(line for line in result.output.splitlines() if line.startswith("claude-md"))
+    assert row.endswith(" / 1,000")
+
+
 def test_generate(tmp_path):
     config = """\
 [project]
@@ -65,6 +162,88 @@ enabled = ["claude-md"]
     assert (tmp_path / "CLAUDE.md").exists()
 
 
+def test_generate_reports_unchanged(tmp_path):
+    config = """\
+[project]
+name = "test"
+
+[targets]
+enabled = ["claude-md", "nonexistent"]
+"""
+    (tmp_path / ".dotruler.toml").write_text(config)
+    args = ["generate", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")]
+    first = runner.invoke(app, args)
+    assert "1 written, 1 skipped" in first.output
+
+    second = runner.invoke(app, args)
+    assert second.exit_code == 0
+    assert "1 unchanged, 1 skipped" in second.output
+
+
+def test_parallel_generate_reports_in_config_order(tmp_path, monkeypatch):
+    import time
+
+    from dotruler.outputs.base import BaseRenderer
+
+    original = BaseRenderer.write_with_report
+
+    def slow_first(self, *args, **kwargs):
+        if self.target_id == "claude-md":
+            time.sleep(0.05)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(BaseRenderer, "write_with_report", slow_first)
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "order"\n[targets]\nenabled = ["claude-md", "aider", "cursorrules"]\n'
+    )
+    result = runner.invoke(
+        app, ["--plain", "generate", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml"), "-j", "3"]
+    )
+    lines = [line.split()[1] for line in result.output.splitlines() if line.startswith("  ✓")]
+    assert lines == ["CLAUDE.md", "CONVENTIONS.md", ".cursorrules"]
+
+
+def test_check(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "ci"\n[style]\nrules = ["Ship it"]\n[targets]\nenabled = ["claude-md", "aider"]\n'
+    )
+    args = ["--plain", "check", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml")]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1
+    assert "stale CLAUDE.md" in result.output and "stale CONVENTIONS.md" in result.output
+
+    runner.invoke(app, ["generate", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml")])
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert result.output == ""
+
+    (tmp_path / "CLAUDE.md").write_text("edited by hand\n")
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1
+    assert result.output == "stale CLAUDE.md\n"
+
+
+def test_check_all(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / ".dotruler.toml").write_text(f'[project]\nname = "{name}"\n[targets]\nenabled = ["aider"]\n')
+    runner.invoke(app, ["generate", str(tmp_path), "--all"])
+    assert runner.invoke(app, ["check", str(tmp_path), "--all"]).exit_code == 0
+
+    (tmp_path / "b" / "CONVENTIONS.md").unlink()
+    result = runner.invoke(app, ["--plain", "check", str(tmp_path), "--all"])
+    assert result.exit_code == 1
+    assert result.output == "stale b/CONVENTIONS.md\n"
+
+
+def test_check_all_without_configs_fails(tmp_path):
+    result = runner.invoke(app, ["--plain", "check", str(tmp_path / "missing"), "--all"])
+    assert result.exit_code == 1
+    assert "No .dotruler.toml found" in result.output
+    result = runner.invoke(app, ["check", str(tmp_path), "--glob", "*/.dotruler.toml"])
+    assert result.exit_code == 1
+
+
 def test_generate_dry_run(tmp_path):
     config = """\
 [project]
@@ -83,6 +262,40 @@ enabled = ["claude-md"]
     assert "would write" in result.output
 
 
+def test_generate_all(tmp_path):
+    config = """\
+[project]
+name = "test"
+
+[targets]
+enabled = ["claude-md", "aider"]
+"""
+    for name in ("packages/web", "services/api", "node_modules/dep"):
+        (tmp_path / name).mkdir(parents=True)
+        (tmp_path / name / ".dotruler.toml").write_text(config)
+
+    result = runner.invoke(app, ["generate", str(tmp_path), "--all", "--workers", "2"])
+    assert result.exit_code == 0
+    assert (tmp_path / "packages" / "web" / "CLAUDE.md").exists()
+    assert (tmp_path / "services" / "api" / "CONVENTIONS.md").exists()
+    assert not (tmp_path / "node_modules" / "dep" / "CLAUDE.md").exists()
+    assert "4 written" in result.output
+
+
+def test_generate_glob_reports_broken_config(tmp_path):
+    for name in ("good", "bad"):
+        (tmp_path / "packages" / name).mkdir(parents=True)
+    (tmp_path / "packages" / "good" / ".dotruler.toml").write_text(
+        '[project]\nname = "good"\n[targets]\nenabled = ["claude-md"]\n'
+    )
+    (tmp_path / "packages" / "bad" / ".dotruler.toml").write_text("[project\n")
+
+    result = runner.invoke(app, ["generate", str(tmp_path), "--glob", "packages/*/.dotruler.toml"])
+    assert result.exit_code == 1
+    assert (tmp_path / "packages" / "good" / "CLAUDE.md").exists()
+    assert "packages/bad" in result.output
+
+
 def test_validate_valid(tmp_path):
     config = """\
 [project]
@@ -137,3 +350,22 @@ enabled = ["claude-md"]
     result = runner.invoke(app, ["diff", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")])
     assert result.exit_code == 0
     assert "unchanged" in result.output
+
+
+def test_diff_truncated_target_unchanged(tmp_path):
+    rules = ", ".join(f'"Rule number {i}"' for i in range(1000))
+    config = f"""\
+[project]
+name = "test"
+
+[style]
+rules = [{rules}]
+
+[targets]
+enabled = ["windsurf"]
+"""
+    (tmp_path / ".dotruler.toml").write_text(config)
+    runner.invoke(app, ["generate", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")])
+    result = runner.invoke(app, ["diff", str(tmp_path), "--config", str(tmp_path / ".dotruler.toml")])
+    assert "unchanged" in result.output
+    assert "in sync" in result.output
@@ -1,9 +1,23 @@
 """Tests for config loading and validation."""
 
+import os
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+
+import dotruler.config as config_module
 import dotruler.outputs  # noqa: F401
-from dotruler.config import _parse_config, load_config, validate_config
+from dotruler.config import (
+    ConfigResolver,
+    _parse_config,
+    config_sources,
+    find_config,
+    find_configs,
+    load_config,
+    validate_config,
+)
+from dotruler.models import StyleConfig
 
 
 def test_parse_config_full(sample_toml, tmp_path):
@@ -14,22 +28,30 @@ def test_parse_config_full(sample_toml, tmp_path):
 
     assert config.project.name == "myapp"
     assert config.project.description == "A test application"
-    assert config.project.languages == ["typescript", "python"]
-    assert config.project.frameworks == ["nextjs", "fastapi"]
+    assert config.project.languages == ("typescript", "python")
+    assert config.project.frameworks == ("nextjs", "fastapi")
     assert len(config.style.rules) == 2
     assert config.commands.build == "npm run build"
     assert config.commands.test == "pytest && npm test"
     assert len(config.architecture.notes) == 2
-    assert config.targets.enabled == ["claude-md", "cursorrules", "copilot"]
+    assert config.targets.enabled == ("claude-md", "cursorrules", "copilot")
     assert "claude-md" in config.targets.overrides
-    assert config.targets.overrides["claude-md"].extra_rules == ["Use Read tool first"]
+    assert config.targets.overrides["claude-md"].extra_rules == ("Use Read tool first",)
 
 
 def test_parse_empty_config():
     config = _parse_config({})
     assert config.project.name == ""
-    assert config.style.rules == []
-    assert config.targets.enabled == ["claude-md", "cursorrules", "copilot"]
+    assert config.style.rules == ()
+    assert config.targets.enabled == ("claude-md", "cursorrules", "copilot")
+
+
+@pytest.mark.parametrize("value", ['"100"', "-1", "true", "1.5"])
+def test_invalid_max_tokens_rejected_on_load(tmp_path, value):
+    path = tmp_path / ".dotruler.toml"
+    path.write_text(f'[project]\nname = "x"\n[targets.claude-md]\nmax_tokens = {value}\n')
+    with pytest.raises(ValueError, match="targets.claude-md.max_tokens must be a non-negative integer"):
+        load_config(path)
 
 
 def test_validate_valid_config(sample_config):
@@ -38,24 +60,223 @@ def test_validate_valid_config(sample_config):
 
 
 def test_validate_missing_name(sample_config):
-    sample_config.project.name = ""
-    issues = validate_config(sample_config)
+    config = replace(sample_config, project=replace(sample_config.project, name=""))
+    issues = validate_config(config)
     assert any("[error] project.name is required" in i for i in issues)
 
 
 def test_validate_empty_rules(sample_config):
-    sample_config.style.rules = []
-    issues = validate_config(sample_config)
+    config = replace(sample_config, style=StyleConfig(rules=[]))
+    issues = validate_config(config)
     assert any("style.rules is empty" in i for i in issues)
 
 
 def test_validate_empty_targets(sample_config):
-    sample_config.targets.enabled = []
-    issues = validate_config(sample_config)
+    config = replace(sample_config, targets=replace(sample_config.targets, enabled=[]))
+    issues = validate_config(config)
     assert any("targets.enabled is empty" in i for i in issues)
 
 
 def test_validate_unknown_target(sample_config):
-    sample_config.targets.enabled.append("nonexistent")
-    issues = validate_config(sample_config)
+    enabled = sample_config.targets.enabled + ("nonexistent",)
+    config = replace(sample_config, targets=replace(sample_config.targets, enabled=enabled))
+    issues = validate_config(config)
     assert any("unknown target 'nonexistent'" in i for i in issues)
+
+
+def test_find_configs_skips_build_dirs(tmp_path):
+    for name in ("a", "b/c", "node_modules/x"):
+        (tmp_path / name).mkdir(parents=True)
+        (tmp_path / name / ".dotruler.toml").write_text("")
+
+    assert find_configs(tmp_path) == [
+        tmp_path / "a" / ".dotruler.toml",
+        tmp_path / "b" / "c" / ".dotruler.toml",
+    ]
+
+
+def _write_old(path: Path, text: str, mtime_ns: int = 1_600_000_000_000_000_000) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_config_memoized_until_file_changes(sample_toml, tmp_path):
+    config_path = tmp_path / ".dotruler.toml"
+    _write_old(config_path, sample_toml)
+
+    first = load_config(config_path)
+    assert load_config(config_path) is first
+    assert load_config(config_path, use_cache=False) is not first
+
+    _write_old(config_path, sample_toml.replace("myapp", "other"), 1_600_000_001_000_000_000)
+    assert load_config(config_path).project.name == "other"
+
+
+def test_recently_modified_config_is_memoized_but_not_snapshotted(sample_toml, tmp_path):
+    config_path = tmp_path / ".dotruler.toml"
+    config_path.write_text(sample_toml)
+
+    assert load_config(config_path, persist=True) is load_config(config_path, persist=True)
+    assert not (tmp_path / ".dotruler").exists()
+
+
+def test_persisted_snapshot_skips_parsing(sample_toml, tmp_path, monkeypatch):
+    config_path = tmp_path / ".dotruler.toml"
+    _write_old(config_path, sample_toml)
+    load_config(config_path, persist=True)
+    assert (tmp_path / ".dotruler" / "cache" / "config.marshal").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("TOML should not be parsed")
+
+    monkeypatch.setattr(config_module, "_CONFIG_MEMO", {})
+    monkeypatch.setattr(config_module, "_MERGED_MEMO", {})
+    monkeypatch.setattr(config_module.tomllib, "load", fail)
+    assert load_config(config_path, persist=True).project.name == "myapp"
+
+
+def test_find_config_walks_up(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text("")
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+
+    assert find_config(nested) == tmp_path / ".dotruler.toml"
+
+
+def test_resolver_shares_ancestor_lookups(tmp_path, monkeypatch):
+    (tmp_path / ".dotruler.toml").write_text("")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / ".dotruler.toml").write_text("")
+    paths = [
+        tmp_path / "pkg" / "src" / "a.py",
+        tmp_path / "pkg" / "src" / "b.py",
+        tmp_path / "pkg" / "tests" / "test_a.py",
+        tmp_path / "docs" / "index.md",
+    ]
+
+    stats: list[str] = []
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stats.append(str(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(config_module.os, "stat", counting_stat)
+    result = ConfigResolver().resolve_many(paths)
+
+    assert result[paths[0]] == tmp_path / "pkg" / ".dotruler.toml"
+    assert result[paths[2]] == tmp_path / "pkg" / ".dotruler.toml"
+    assert result[paths[3]] == tmp_path / ".dotruler.toml"
+    # pkg/src, pkg, pkg/tests, docs, root — one stat each.
+    assert len(stats) == 5
+
+
+ROOT_TOML = """\
+[project]
+languages = ["python"]
+
+[style]
+rules = ["Shared rule"]
+
+[targets]
+enabled = ["claude-md", "aider"]
+
+[targets.claude-md]
+extra_rules = ["Shared extra"]
+"""
+
+
+def test_extends_merges_parent_first(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(ROOT_TOML)
+    pkg = tmp_path / "packages" / "web"
+    pkg.mkdir(parents=True)
+    (pkg / ".dotruler.toml").write_text(
+        'extends = "../../.dotruler.toml"\n'
+        '[project]\nname = "web"\n'
+        '[style]\nrules = ["Package rule"]\n'
+        '[targets]\nenabled = ["claude-md"]\n'
+        '[targets.claude-md]\nextra_rules = ["Package extra"]\n'
+    )
+
+    config = load_config(pkg / ".dotruler.toml")
+    assert config.project.name == "web"
+    assert config.project.languages == ("python",)
+    assert config.style.rules == ("Shared rule", "Package rule")
+    assert config.targets.enabled == ("claude-md",)
+    assert config.targets.overrides["claude-md"].extra_rules == ("Shared extra", "Package extra")
+    assert config_sources(pkg / ".dotruler.toml") == [pkg / ".dotruler.toml", tmp_path / ".dotruler.toml"]
+
+
+def test_shared_parent_parsed_once(tmp_path, monkeypatch):
+    (tmp_path / ".dotruler.toml").write_text(ROOT_TOML)
+    children = []
+    for i in range(5):
+        pkg = tmp_path / f"pkg{i}"
+        pkg.mkdir()
+        (pkg / ".dotruler.toml").write_text(f'extends = "../.dotruler.toml"\n[project]\nname = "p{i}"\n')
+        children.append(pkg / ".dotruler.toml")
+
+    parsed: list[str] = []
+    original = config_module._read_toml
+
+    def counting(path):
+        parsed.append(str(path))
+        return original(path)
+
+    monkeypatch.setattr(config_module, "_read_toml", counting)
+    names = [load_config(child).project.name for child in children]
+
+    assert names == ["p0", "p1", "p2", "p3", "p4"]
+    assert parsed.count(str(tmp_path / ".dotruler.toml")) == 1
+    assert len(parsed) == 6
+
+
+def test_parent_change_invalidates_child(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(ROOT_TOML)
+    (tmp_path / "pkg").mkdir()
+    child = tmp_path / "pkg" / ".dotruler.toml"
+    child.write_text('extends = "../.dotruler.toml"\n')
+    assert load_config(child).style.rules == ("Shared rule",)
+
+    _write_old(tmp_path / ".dotruler.toml", ROOT_TOML.replace("Shared rule", "New rule"))
+    assert load_config(child).style.rules == ("New rule",)
+
+
+def test_extends_cycle_and_missing_parent(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / ".dotruler.toml").write_text('extends = "../.dotruler.toml"\n')
+    (tmp_path / ".dotruler.toml").write_text('extends = ["a/.dotruler.toml"]\n')
+    with pytest.raises(ValueError, match="circular extends"):
+        load_config(tmp_path / ".dotruler.toml")
+
+    (tmp_path / ".dotruler.toml").write_text('extends = "missing.toml"\n')
+    with pytest.raises(FileNotFoundError):
+        load_config(tmp_path / ".dotruler.toml")
+
+
+def test_models_are_frozen_and_hashable(sample_config):
+    same = _parse_config(
+        {
+            "project": {
+                "name": "myapp",
+                "description": "A test application",
+                "languages": ["typescript", "python"],
+                "frameworks": ["nextjs", "fastapi"],
+            },
+            "style": {"rules": ["Use functional components", "Prefer const over let"]},
+            "commands": {"build": "npm run build", "test": "pytest && npm test", "lint": "ruff check .", "dev": "npm run dev"},
+            "architecture": {"notes": ["API routes in src/app/api/", "Models in src/models/"]},
+            "targets": {
+                "enabled": ["claude-md", "cursorrules", "copilot"],
+                "claude-md": {"extra_rules": ["Use Read tool first"]},
+            },
+        }
+    )
+    assert same == sample_config
+    assert hash(same) == hash(sample_config)
+    assert {same: 1}[sample_config] == 1
+    assert sample_config.commands.as_dict() is sample_config.commands.as_dict()
+
+    with pytest.raises(AttributeError):
+        sample_config.project.name = "other"
+    assert not hasattr(sample_config.style, "__dict__")
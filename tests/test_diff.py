@@ -0,0 +1,45 @@
+"""Tests for the section-aware diff engine."""
+
+import difflib
+
+from dotruler.diff import diff_stat, split_sections, unified_diff
+
+
+def make_lines(sections: int, bullets: int) -> list[str]:
+    lines = ["# Project"]
+    for s in range(sections):
+        lines += ["", f"## Section {s}", ""] + [f"- item {s}.{i}" for i in range(bullets)]
+    return lines
+
+
+def reference(a: list[str], b: list[str]) -> list[str]:
+    return list(difflib.unified_diff(a, b, "CLAUDE.md", "CLAUDE.md", lineterm=""))
+
+
+def test_split_sections():
+    assert split_sections(["# T", "", "## A", "", "- a", "- b", ""]) == [(0, 2), (2, 4), (4, 7)]
+    assert split_sections([]) == []
+
+
+def test_matches_difflib():
+    a = make_lines(50, 20)
+    b = list(a)
+    b[5] = "- edited"
+    del b[300:305]
+    b.insert(700, "- inserted")
+    b += ["", "---", "footer"]
+    assert list(unified_diff(a, b, "CLAUDE.md", "CLAUDE.md")) == reference(a, b)
+    assert list(unified_diff(b, a, "CLAUDE.md", "CLAUDE.md")) == reference(b, a)
+
+
+def test_new_and_equal_files():
+    b = make_lines(2, 2)
+    assert list(unified_diff([], b, "CLAUDE.md", "CLAUDE.md")) == reference([], b)
+    assert list(unified_diff(b, b)) == []
+    assert diff_stat(b, b) == (0, 0)
+
+
+def test_diff_stat():
+    a = make_lines(10, 10)
+    b = [line.replace("item 3.4", "item 3.4 changed") for line in a if line != "- item 7.1"]
+    assert diff_stat(a, b) == (1, 2)
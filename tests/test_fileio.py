@@ -0,0 +1,86 @@
+"""Tests for atomic, locked writes of generated files."""
+
+import os
+import stat
+import threading
+import time
+
+from dotruler.fileio import write_chunks_if_changed, write_if_changed
+from dotruler.state import project_lock
+
+
+def test_write_is_atomic_and_keeps_mode(tmp_path):
+    path = tmp_path / "out" / "CLAUDE.md"
+    assert write_if_changed(path, b"one\n")
+    os.chmod(path, 0o640)
+
+    assert write_if_changed(path, b"two\n")
+    assert not write_if_changed(path, b"two\n")
+    assert path.read_bytes() == b"two\n"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert os.listdir(path.parent) == ["CLAUDE.md"]
+
+
+def test_new_file_gets_default_mode(tmp_path):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    write_chunks_if_changed(tmp_path / "AGENTS.md", [b"a", b"b"])
+    assert stat.S_IMODE(os.stat(tmp_path / "AGENTS.md").st_mode) == 0o666 & ~umask
+
+
+def test_failed_write_leaves_old_file(tmp_path):
+    path = tmp_path / "CLAUDE.md"
+    path.write_bytes(b"old\n")
+
+    def chunks():
+        yield b"new"
+        raise RuntimeError("render failed")
+
+    try:
+        write_chunks_if_changed(path, chunks())
+    except RuntimeError:
+        pass
+    assert path.read_bytes() == b"old\n"
+    assert os.listdir(tmp_path) == ["CLAUDE.md"]
+
+
+def test_project_lock_serializes_writers(tmp_path):
+    events = []
+
+    def writer(name):
+        with project_lock(tmp_path):
+            events.append(f"{name} start")
+            time.sleep(0.05)
+            events.append(f"{name} end")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in "ab"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert events[0].endswith("start") and events[1].endswith("end")
+    assert events[0].split()[0] == events[1].split()[0]
+    assert (tmp_path / ".dotruler" / ".gitignore").exists()
+
+
+def test_writes_through_symlinks(tmp_path):
+    shared = tmp_path / "shared" / "CLAUDE.md"
+    shared.parent.mkdir()
+    shared.write_bytes(b"old\n")
+    link = tmp_path / "CLAUDE.md"
+    link.symlink_to(shared)
+
+    assert write_if_changed(link, b"new\n")
+    assert link.is_symlink() and shared.read_bytes() == b"new\n"
+    assert write_chunks_if_changed(link, [b"newer", b"\n"])
+    assert link.is_symlink() and shared.read_bytes() == b"newer\n"
+    assert sorted(os.listdir(shared.parent)) == ["CLAUDE.md"]
+
+
+def test_new_file_mode_leaves_umask_alone(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(os, "umask", lambda mask: calls.append(mask))
+    write_if_changed(tmp_path / "CLAUDE.md", b"x\n")
+    write_chunks_if_changed(tmp_path / "AGENTS.md", [b"x\n"])
+    assert calls == []
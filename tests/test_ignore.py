@@ -0,0 +1,57 @@
+"""Tests for .gitignore matching."""
+
+from dotruler.ignore import IgnoreFile, IgnoreMatcher, signature
+from dotruler.scanner import scan_project
+
+
+def test_patterns():
+    rules = IgnoreFile("# comment\n\n*.log\n/build\ncoverage/\ndocs/**/gen\nbazel-*\n\\#notes\n")
+    assert rules.match("a.log", False) and rules.match("x/y/a.log", False)
+    assert rules.match("build", True) and rules.match("src/build", True) is None
+    assert rules.match("coverage", True) and rules.match("coverage", False) is None
+    assert rules.match("docs/gen", True) and rules.match("docs/a/b/gen", True)
+    assert rules.match("bazel-out", True)
+    assert rules.match("#notes", False)
+    assert rules.match("src/app.py", False) is None
+
+
+def test_negation_and_last_match_wins():
+    rules = IgnoreFile("*.py\n!keep.py\nkeep.py\n!main.py\n")
+    assert rules.match("a.py", False) is True
+    assert rules.match("keep.py", False) is True
+    assert rules.match("main.py", False) is False
+
+
+def test_deeper_file_decides(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / ".gitignore").write_text("*.js\n")
+    (tmp_path / "pkg" / ".gitignore").write_text("!vendor.js\n/out/\n")
+    sources = tuple(
+        (base, str(path), signature(path.stat()))
+        for base, path in [("", tmp_path / ".gitignore"), ("pkg", tmp_path / "pkg" / ".gitignore")]
+    )
+    m = IgnoreMatcher(sources)
+    assert m.ignored("app.js", False)
+    assert m.ignored("pkg/app.js", False)
+    assert not m.ignored("pkg/vendor.js", False)
+    assert m.ignored("pkg/out", True) and not m.ignored("out", True)
+
+
+def test_bracket_expressions():
+    rules = IgnoreFile("foo[]]bar\n[[]x\n[!a]b\n[a-c]d\n")
+    assert rules.match("foo]bar", False) and rules.match("[x", False)
+    assert rules.match("zb", False) and rules.match("ab", False) is None
+    assert rules.match("bd", False) and rules.match("-d", False) is None
+
+
+def test_invalid_patterns_are_skipped(recwarn):
+    rules = IgnoreFile("[]\n[!]\n[z-a]\nunclosed[ab\n*.log\n")
+    assert rules.match("a.log", False)
+    assert rules.match("[]", False) is None and rules.match("z", False) is None
+    assert not [w for w in recwarn if issubclass(w.category, FutureWarning)]
+
+
+def test_scan_survives_unusual_gitignore(tmp_path):
+    (tmp_path / ".gitignore").write_text("foo[]]bar\n[]\n[!]\n[z-a]\n[[]\n")
+    (tmp_path / "app.py").write_text("")
+    assert scan_project(tmp_path)["languages"] == ["python"]
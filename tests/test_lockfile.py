@@ -0,0 +1,82 @@
+"""Tests for .dotruler.lock and lock-based staleness checks."""
+
+import hashlib
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from dotruler.cli import app
+from dotruler.lockfile import DigestCache, read_lock
+from dotruler.outputs.base import BaseRenderer
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / ".dotruler.toml").write_text(
+        '[project]\nname = "lock"\n[style]\nrules = ["Pin it"]\n[targets]\nenabled = ["claude-md", "aider"]\n'
+    )
+    runner.invoke(app, ["generate", str(tmp_path), "-c", str(tmp_path / ".dotruler.toml")])
+    return tmp_path
+
+
+def no_render(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("rendered")
+
+    monkeypatch.setattr(BaseRenderer, "build_with_report", fail)
+
+
+def test_generate_writes_lock(project):
+    lock = read_lock(project)
+    assert set(lock["outputs"]) == {"claude-md", "aider"}
+    entry = lock["outputs"]["claude-md"]
+    assert entry["path"] == "CLAUDE.md"
+    assert entry["size"] == (project / "CLAUDE.md").stat().st_size
+    assert entry["tokens"] > 0
+    assert "dotruler.outputs.claude_md.ClaudeMdRenderer:1" in json.dumps(lock["source"])
+
+
+def test_in_sync_targets_are_not_rendered(project, monkeypatch):
+    no_render(monkeypatch)
+    args = ["check", str(project), "-c", str(project / ".dotruler.toml")]
+    assert runner.invoke(app, args).exit_code == 0
+    result = runner.invoke(app, ["--plain", "generate", str(project), "-c", str(project / ".dotruler.toml")])
+    assert result.exit_code == 0
+    assert "2 unchanged" in result.output
+
+    (project / "CLAUDE.md").write_text("edited by hand\n")
+    result = runner.invoke(app, ["--plain", *args])
+    assert result.exit_code == 1
+    assert result.output == "stale CLAUDE.md\n"
+
+
+def test_config_change_falls_back_to_rendering(project):
+    (project / ".dotruler.toml").write_text(
+        '[project]\nname = "lock"\n[style]\nrules = ["Pin it", "Again"]\n[targets]\nenabled = ["claude-md", "aider"]\n'
+    )
+    result = runner.invoke(app, ["--plain", "check", str(project), "-c", str(project / ".dotruler.toml")])
+    assert result.exit_code == 1
+    assert "stale CLAUDE.md" in result.output and "stale CONVENTIONS.md" in result.output
+
+    runner.invoke(app, ["generate", str(project), "-c", str(project / ".dotruler.toml")])
+    assert "Again" in (project / "CLAUDE.md").read_text()
+    assert read_lock(project)["outputs"]["claude-md"]["size"] == (project / "CLAUDE.md").stat().st_size
+
+
+def test_digest_cache_skips_reads_of_unchanged_files(tmp_path, monkeypatch):
+    path = tmp_path / "CLAUDE.md"
+    path.write_text("hello\n")
+    digests = DigestCache(tmp_path)
+    sha, size = digests.digest(path)
+    assert (sha, size) == (hashlib.sha256(b"hello\n").hexdigest(), 6)
+    assert digests.digest(path, expected_size=7) == ("", 6)
+
+    monkeypatch.setattr("dotruler.lockfile.RACY_WINDOW_NS", -(10**18))  # trust hashes taken just now
+    digests.save()
+    reads = []
+    monkeypatch.setattr("hashlib.file_digest", lambda *args: reads.append(args))
+    assert DigestCache(tmp_path).digest(path) == (sha, 6)
+    assert reads == []
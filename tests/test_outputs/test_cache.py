@@ -0,0 +1,85 @@
+"""Tests for the rendered output cache."""
+
+from dataclasses import replace
+
+import dotruler.outputs  # noqa: F401
+from dotruler.models import StyleConfig
+from dotruler.outputs import cache as cache_module
+from dotruler.outputs.cache import RenderCache, config_fingerprint, render_key
+from dotruler.registry import get_renderer
+
+
+def test_fingerprint_tracks_content(sample_config):
+    copy = replace(sample_config, style=StyleConfig(rules=list(sample_config.style.rules)))
+    changed = replace(sample_config, style=StyleConfig(rules=["Something else"]))
+
+    assert config_fingerprint(copy) == config_fingerprint(sample_config)
+    assert config_fingerprint(changed) != config_fingerprint(sample_config)
+
+
+def test_build_is_served_from_cache(sample_config, monkeypatch):
+    cache = RenderCache()
+    monkeypatch.setattr("dotruler.outputs.base.render_cache", cache)
+    renderer = get_renderer("claude-md")()
+    calls = []
+    original = renderer.render_document
+    monkeypatch.setattr(renderer, "render_document", lambda doc: calls.append(doc) or original(doc))
+
+    first = renderer.build(sample_config)
+    assert renderer.build(sample_config) == first
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    renderer.version += 1
+    renderer.build(sample_config)
+    assert len(calls) == 2
+
+
+def test_lru_evicts_oldest():
+    cache = RenderCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert len(cache) == 2
+
+
+def test_persisted_across_runs(sample_config, tmp_path):
+    renderer = get_renderer("aider")()
+    key = render_key(renderer, sample_config)
+    cache = RenderCache()
+    cache.put(key, "rendered")
+    cache.save(tmp_path)
+
+    fresh = RenderCache()
+    fresh.load(tmp_path)
+    assert fresh.get(key) == "rendered"
+
+
+def test_persisted_cache_ignored_after_upgrade(tmp_path, monkeypatch):
+    cache = RenderCache()
+    cache.put("key", "rendered")
+    cache.save(tmp_path)
+
+    monkeypatch.setattr(cache_module, "__version__", "999")
+    fresh = RenderCache()
+    fresh.load(tmp_path)
+    assert fresh.get("key") is None
+
+
+def test_load_keeps_persisted_lru_order(tmp_path):
+    cache = RenderCache()
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.save(tmp_path)
+
+    fresh = RenderCache(max_entries=3)
+    fresh.put("new", "NEW")
+    fresh.load(tmp_path)
+    # "a" was least recently used when saved, so it's the one evicted.
+    assert fresh.get("a") is None
+    assert fresh.get("c") == "C"
+    assert fresh.get("new") == "NEW"
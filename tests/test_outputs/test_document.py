@@ -0,0 +1,38 @@
+"""Tests for the shared document model."""
+
+from dataclasses import replace
+
+import dotruler.outputs  # noqa: F401
+from dotruler.models import StyleConfig, TargetOverride
+from dotruler.outputs.document import Document
+from dotruler.registry import list_targets
+
+
+def test_document_fragments(sample_config):
+    doc = Document.from_config(sample_config)
+
+    assert doc.languages == "typescript, python"
+    assert doc.rule_lines == "- Use functional components\n- Prefer const over let"
+    assert doc.rules_for("claude-md")[-1] == "Use Read tool first"
+    assert doc.rule_lines_for("claude-md").endswith("\n- Use Read tool first")
+    assert doc.rule_lines_for("cursorrules") == doc.rule_lines
+    assert doc.command_lines("{name}={cmd}").splitlines()[0] == "build=npm run build"
+
+
+def test_extra_rules_without_base_rules(minimal_config):
+    config = replace(
+        minimal_config,
+        style=StyleConfig(),
+        targets=replace(minimal_config.targets, overrides={"aider": TargetOverride(extra_rules=["Only"])}),
+    )
+    doc = Document.from_config(config)
+
+    assert doc.rule_lines_for("aider") == "- Only"
+    assert doc.rule_lines_for("claude-md") == ""
+
+
+def test_shared_document_matches_per_config_render(sample_config):
+    doc = Document.from_config(sample_config)
+    for _, renderer_cls in list_targets().items():
+        renderer = renderer_cls()
+        assert renderer.render_document(doc) == renderer.render(sample_config)
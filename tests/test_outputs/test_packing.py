@@ -0,0 +1,91 @@
+"""Tests for fitting rendered output into a target's size limit."""
+
+from dataclasses import replace
+
+import dotruler.outputs  # noqa: F401
+from dotruler.models import ArchitectureConfig, StyleConfig, TargetOverride
+from dotruler.outputs.document import Document
+from dotruler.outputs.packing import measure, pack
+from dotruler.registry import get_renderer
+
+
+def _big(config, rules=1000, notes=200):
+    return replace(
+        config,
+        style=StyleConfig(rules=[f"Rule number {i}" for i in range(rules)]),
+        architecture=ArchitectureConfig(notes=[f"Note {i}" for i in range(notes)]),
+    )
+
+
+def test_packed_output_keeps_whole_rules(sample_config):
+    renderer = get_renderer("windsurf")()
+    content, report = renderer.build_with_report(_big(sample_config))
+
+    assert len(content) <= renderer.max_chars
+    assert content.endswith("\n")
+    assert not report.truncated
+    assert report.dropped_rules
+    kept = [line[2:] for line in content.splitlines() if line.startswith("- Rule number")]
+    assert kept == [f"Rule number {i}" for i in range(len(kept))]
+    assert len(kept) + len(report.dropped_rules) == 1000
+
+
+def test_pack_is_as_full_as_greedy_allows(sample_config):
+    renderer = get_renderer("windsurf")()
+    doc = Document.from_config(_big(sample_config))
+    packed, report = pack(renderer, doc, renderer.max_chars, renderer.limit_unit)
+
+    used = len(renderer.render_document(packed))
+    assert used <= renderer.max_chars
+    # The rules section is open, so any dropped rule costs its bullet plus a newline.
+    assert renderer.max_chars - used < len("- ") + len(min(report.dropped_rules, key=len)) + 1
+
+
+def test_target_rules_outrank_shared_rules_and_notes(sample_config):
+    config = _big(sample_config)
+    overrides = {"windsurf": TargetOverride(extra_rules=["Windsurf only"])}
+    config = replace(config, targets=replace(config.targets, overrides=overrides))
+    content, report = get_renderer("windsurf")().build_with_report(config)
+
+    assert "- Windsurf only" in content
+    assert len(report.dropped_notes) == 200
+    assert report.summary().startswith("dropped ")
+
+
+def test_codex_limit_counts_bytes(sample_config):
+    config = replace(sample_config, style=StyleConfig(rules=[f"Règle numéro {i} — é" for i in range(3000)]))
+    renderer = get_renderer("codex")()
+    content, report = renderer.build_with_report(config)
+
+    assert measure(content, "bytes") <= renderer.max_chars
+    assert len(content) < renderer.max_chars
+    assert report.dropped_rules
+
+
+def test_streamed_write_is_packed(sample_config, tmp_path):
+    renderer = get_renderer("windsurf")()
+    config = _big(sample_config)
+    path, _, report = renderer.write_with_report(config, tmp_path, stream=True)
+
+    assert path.read_text() == renderer.build(config)
+    assert report == renderer.build_with_report(config)[1]
+
+
+def test_config_that_fits_is_untouched(sample_config):
+    content, report = get_renderer("windsurf")().build_with_report(sample_config)
+    assert not report
+    assert content == get_renderer("windsurf")().render(sample_config)
+
+
+def test_token_budget_from_override(sample_config):
+    config = _big(sample_config)
+    overrides = {"claude-md": TargetOverride(max_tokens=500)}
+    config = replace(config, targets=replace(config.targets, overrides=overrides))
+    renderer = get_renderer("claude-md")()
+    content, report = renderer.build_with_report(config)
+
+    assert measure(content, "tokens") == report.tokens <= 500
+    assert report.tokens > 450
+    assert report.dropped_rules and len(report.dropped_notes) == 200
+    assert renderer.limits(config) == [(500, "tokens")]
+    assert "".join(renderer.stream(config)) == content
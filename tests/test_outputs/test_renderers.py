@@ -1,8 +1,13 @@
 """Tests for all output renderers."""
 
+import os
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+
 import dotruler.outputs  # noqa: F401
+from dotruler.models import StyleConfig, TargetOverride, TargetsConfig
 from dotruler.registry import get_renderer, list_targets
 
 
@@ -90,6 +95,22 @@ def test_write_creates_file(sample_config, tmp_path):
     assert "# myapp" in content
 
 
+def test_write_skips_unchanged_content(sample_config, tmp_path):
+    renderer = get_renderer("claude-md")()
+    output_path, changed = renderer.write_if_changed(sample_config, tmp_path)
+    assert changed
+    os.utime(output_path, ns=(1_000_000_000, 1_000_000_000))
+
+    _, changed = renderer.write_if_changed(sample_config, tmp_path)
+    assert not changed
+    assert output_path.stat().st_mtime_ns == 1_000_000_000
+
+    output_path.write_text("edited by hand")
+    _, changed = renderer.write_if_changed(sample_config, tmp_path)
+    assert changed
+    assert "# myapp" in output_path.read_text()
+
+
 def test_write_creates_subdirectory(sample_config, tmp_path):
     """Copilot output creates .github/ directory."""
     renderer = get_renderer("copilot")()
@@ -102,7 +123,7 @@ def test_write_creates_subdirectory(sample_config, tmp_path):
 def test_windsurf_truncation(sample_config):
     """Windsurf renderer should respect char limit."""
     # Add a ton of rules to exceed limit
-    sample_config.style.rules = [f"Rule number {i}" for i in range(1000)]
+    sample_config = replace(sample_config, style=StyleConfig(rules=[f"Rule number {i}" for i in range(1000)]))
     renderer = get_renderer("windsurf")()
     output = renderer.render(sample_config)
 
@@ -113,3 +134,79 @@ def test_windsurf_truncation(sample_config):
         path = renderer.write(sample_config, Path(tmp))
         content = path.read_text()
         assert len(content) <= 12_000
+
+
+def test_stream_matches_build(sample_config):
+    big = replace(sample_config, style=StyleConfig(rules=[f"Rule number {i}" for i in range(1000)]))
+    for target_id, cls in list_targets().items():
+        renderer = cls()
+        assert "".join(renderer.stream(big)) == renderer.build(big), target_id
+
+
+def test_stream_matches_build_when_truncated(sample_config):
+    for max_tokens in range(1, 60):
+        config = replace(
+            sample_config,
+            targets=TargetsConfig(
+                enabled=["claude-md"], overrides={"claude-md": TargetOverride(max_tokens=max_tokens)}
+            ),
+        )
+        renderer = get_renderer("claude-md")()
+        assert "".join(renderer.stream(config)) == renderer.build(config), max_tokens
+
+
+def test_streamed_write(sample_config, tmp_path):
+    renderer = get_renderer("windsurf")()
+    big = replace(sample_config, style=StyleConfig(rules=[f"Rule number {i}" for i in range(1000)]))
+
+    path, changed = renderer.write_if_changed(big, tmp_path, stream=True)
+    assert changed
+    assert path.read_text() == renderer.build(big)
+
+    _, changed = renderer.write_if_changed(big, tmp_path, stream=True)
+    assert not changed
+    assert os.listdir(tmp_path) == [".windsurfrules"]
+
+
+def test_render_document_only_renderer_streams(sample_config):
+    from dotruler.outputs.base import BaseRenderer
+
+    class Legacy(BaseRenderer):
+        target_id = "legacy"
+
+        def render_document(self, doc):
+            return f"# {doc.name}\n"
+
+    assert list(Legacy().stream(sample_config)) == ["# myapp\n"]
+
+
+def test_render_only_renderer_still_works(sample_config, tmp_path):
+    from dotruler.outputs.base import BaseRenderer
+
+    class Legacy(BaseRenderer):
+        target_id = "legacy"
+        default_output_path = "LEGACY.md"
+        max_chars = 5
+
+        def render(self, config):
+            return f"# {config.project.name}\n"
+
+    renderer = Legacy()
+    assert renderer.build(sample_config) == "# mya"
+    path, changed = renderer.write_if_changed(sample_config, tmp_path, stream=True)
+    assert changed and path.read_text() == "# mya"
+
+    overrides = {"legacy": TargetOverride(extra_rules=("Only here",))}
+    config = replace(sample_config, targets=TargetsConfig(overrides=overrides))
+    assert renderer.get_all_rules(config) == [*sample_config.style.rules, "Only here"]
+    assert renderer.get_all_rules(sample_config) == list(sample_config.style.rules)
+
+
+def test_renderer_without_render_methods_raises(sample_config):
+    from dotruler.outputs.base import BaseRenderer
+
+    class Empty(BaseRenderer):
+        target_id = "empty"
+
+    with pytest.raises(NotImplementedError, match="Empty must implement"):
+        Empty().build(sample_config)
@@ -0,0 +1,89 @@
+"""Tests for the lazy target registry."""
+
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from dotruler import registry
+from dotruler.outputs import BUILTIN_TARGETS
+from dotruler.outputs.base import BaseRenderer
+from dotruler.outputs.document import Document
+from dotruler.registry import TargetSpec, get_renderer, get_spec, list_specs, target_ids
+
+
+class ExampleRenderer(BaseRenderer):
+    target_id = "example"
+    default_output_path = "EXAMPLE.md"
+    description = "Example plugin target"
+
+    def render_document(self, doc: Document) -> str:
+        return f"# {doc.name}\n"
+
+
+EXAMPLE_SPEC = TargetSpec(
+    "ignored",
+    "tests.test_registry:ExampleRenderer",
+    output_path="EXAMPLE.md",
+    description="Example plugin target",
+)
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    """Install fake entry points and restore registry state afterwards."""
+    monkeypatch.setattr(registry, "_SPECS", dict(registry._SPECS))
+    monkeypatch.setattr(registry, "_REGISTRY", dict(registry._REGISTRY))
+
+    def install(*eps: EntryPoint) -> None:
+        monkeypatch.setattr(registry, "entry_points", lambda group: eps)
+        registry._entry_point_refs.cache_clear()
+
+    yield install
+    registry._entry_point_refs.cache_clear()
+
+
+def test_builtin_specs_match_renderer_classes():
+    for spec in BUILTIN_TARGETS:
+        cls = get_renderer(spec.target_id)
+        assert cls.target_id == spec.target_id
+        assert cls.default_output_path == spec.output_path
+        assert cls.description == spec.description
+        assert cls.max_chars == spec.max_chars
+        assert cls.limit_unit == spec.limit_unit
+
+
+def test_list_and_validate_do_not_import_renderers(tmp_path):
+    code = (
+        "import sys\n"
+        "from dotruler.config import _parse_config, validate_config\n"
+        "from dotruler.registry import list_specs\n"
+        "list_specs(); validate_config(_parse_config({'project': {'name': 'x'}}))\n"
+        "print(sorted(m for m in sys.modules if m.startswith('dotruler.outputs.')))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_entry_point_spec_is_listed_without_loading_renderer(plugins):
+    plugins(EntryPoint("example", "tests.test_registry:EXAMPLE_SPEC", registry.ENTRY_POINT_GROUP))
+
+    assert "example" in target_ids()
+    spec = list_specs()["example"]
+    assert spec.target_id == "example"
+    assert spec.output_path == "EXAMPLE.md"
+    assert "example" not in registry._REGISTRY
+    assert get_renderer("example") is ExampleRenderer
+
+
+def test_entry_point_renderer_class(plugins):
+    plugins(EntryPoint("example", "tests.test_registry:ExampleRenderer", registry.ENTRY_POINT_GROUP))
+
+    assert get_spec("example").description == "Example plugin target"
+    assert get_renderer("example") is ExampleRenderer
+
+
+def test_unknown_target_lists_available():
+    with pytest.raises(KeyError, match="Available: aider, claude-md"):
+        get_spec("nonexistent")
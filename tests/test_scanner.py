@@ -1,14 +1,20 @@
 """Tests for the codebase scanner."""
 
 import json
+import os
 from pathlib import Path
 
+import dotruler.scanner as scanner
+
 from dotruler.scanner import (
+    ProjectIndex,
+    find_subprojects,
     scan_commands,
     scan_existing_ai_configs,
     scan_frameworks,
     scan_languages,
     scan_project,
+    significant_languages,
 )
 
 
@@ -34,6 +40,49 @@ def test_scan_languages_skips_node_modules(tmp_path):
     assert "javascript" not in langs
 
 
+def test_scan_languages_respects_max_depth(tmp_path):
+    deep = tmp_path / "a" / "b" / "c"
+    deep.mkdir(parents=True)
+    (deep / "main.rs").write_text("fn main() {}")
+    (tmp_path / "a" / "app.py").write_text("print('hello')")
+
+    assert scan_languages(tmp_path, max_depth=2) == ["python"]
+    assert scan_languages(tmp_path, max_depth=3) == ["python", "rust"]
+
+
+def test_language_stats_and_thresholds(tmp_path):
+    (tmp_path / "src").mkdir()
+    for i in range(60):
+        (tmp_path / "src" / f"m{i}.ts").write_text("export const x = 1;\n")
+    (tmp_path / "init.lua").write_text("x = 1")
+    (tmp_path / "big.go").write_text("// go\n" * 200)
+
+    stats = ProjectIndex(tmp_path).language_stats(max_depth=5)
+    assert stats["typescript"] == (60, 60 * 20)
+    assert stats["lua"] == (1, 5)
+    # go has one file but most of the bytes; lua has neither
+    assert scan_languages(tmp_path) == ["go", "typescript"]
+    assert significant_languages(stats, min_share=0) == ["go", "lua", "typescript"]
+
+
+def test_scan_languages_finds_deep_files(tmp_path):
+    deep = tmp_path.joinpath(*"abcdefgh")
+    deep.mkdir(parents=True)
+    (deep / "main.rs").write_text("fn main() {}")
+    assert scan_languages(tmp_path) == ["rust"]
+
+
+def test_time_budget_keeps_shallow_results(tmp_path):
+    (tmp_path / "app.py").write_text("")
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "main.go").write_text("")
+    index = ProjectIndex(tmp_path)
+    assert scan_languages(tmp_path, index=index, time_budget=0) == ["python"]
+    assert not index.complete
+    assert scan_languages(tmp_path, index=index) == ["go", "python"]
+    assert index.complete
+
+
 def test_scan_frameworks_from_config_files(tmp_path):
     (tmp_path / "next.config.js").write_text("module.exports = {}")
     (tmp_path / "tailwind.config.js").write_text("module.exports = {}")
@@ -92,3 +141,195 @@ def test_scan_project_full(tmp_path):
     assert "python" in result["languages"]
     assert "test" in result["commands"]
     assert "claude-md" in result["existing_ai_configs"]
+
+
+def test_scan_project_parses_each_manifest_once(tmp_path, monkeypatch):
+    pkg = {"dependencies": {"react": "^18.0.0"}, "scripts": {"build": "vite build"}}
+    (tmp_path / "package.json").write_text(json.dumps(pkg))
+    (tmp_path / "pyproject.toml").write_text("[project]\ndependencies = ['fastapi']\n")
+
+    parsed: list[str] = []
+    original = ProjectIndex._parse_manifest
+
+    def counting(self, filename):
+        parsed.append(filename)
+        return original(self, filename)
+
+    monkeypatch.setattr(ProjectIndex, "_parse_manifest", counting)
+    result = scan_project(tmp_path)
+
+    assert sorted(parsed) == ["package.json", "pyproject.toml"]
+    assert result["frameworks"] == ["fastapi", "react"]
+    assert result["commands"]["build"] == "npm run build"
+
+
+def test_project_index_nested_ai_config_requires_parent(tmp_path):
+    index = ProjectIndex(tmp_path)
+    assert not index.has(".github/copilot-instructions.md")
+
+    (tmp_path / ".github").mkdir()
+    assert not ProjectIndex(tmp_path).has(".github/copilot-instructions.md")
+
+
+def test_find_subprojects(tmp_path):
+    (tmp_path / "package.json").write_text("{}")
+    for name in ("packages/web", "services/api"):
+        (tmp_path / name).mkdir(parents=True)
+    (tmp_path / "packages" / "web" / "package.json").write_text("{}")
+    (tmp_path / "services" / "api" / "pyproject.toml").write_text("")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "package.json").write_text("{}")
+
+    projects = find_subprojects(tmp_path)
+    assert projects == [tmp_path, tmp_path / "packages" / "web", tmp_path / "services" / "api"]
+
+
+def test_symlinked_directories_are_not_followed(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "pyproject.toml").write_text("")
+    for i in range(20):
+        (tmp_path / "src" / f"m{i}.py").write_text("")
+    (tmp_path / "src" / "up").symlink_to("..")
+    (tmp_path / "src" / "again").symlink_to(tmp_path)
+
+    stats = scan_project(tmp_path)["language_stats"]
+    assert stats["python"].files == 20
+    assert find_subprojects(tmp_path) == [tmp_path]
+
+
+def _age_tree(root: Path, timestamp: int = 1_600_000_000) -> None:
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (timestamp, timestamp))
+
+
+def test_scan_cache_skips_unchanged_directories(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("")
+    _age_tree(tmp_path)
+    assert scan_languages(tmp_path, use_cache=True) == ["python"]
+    assert (tmp_path / ".dotruler" / "cache" / "scan.marshal").exists()
+
+    listed: list[str] = []
+    original = scanner._scan_dir
+
+    def counting(path, *args, **kwargs):
+        listed.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "_scan_dir", counting)
+    _age_tree(tmp_path)  # saving the cache touched the root
+    assert scan_languages(tmp_path, use_cache=True) == ["python"]
+    assert listed == []
+
+    (tmp_path / "src" / "main.go").write_text("")
+    assert scan_languages(tmp_path, use_cache=True) == ["go", "python"]
+    assert listed == [str(tmp_path / "src")]
+
+
+def test_scan_without_cache_writes_nothing(tmp_path):
+    (tmp_path / "app.py").write_text("")
+    scan_project(tmp_path)
+    assert not (tmp_path / ".dotruler").exists()
+
+
+def test_scan_honors_nested_gitignore(tmp_path, monkeypatch):
+    (tmp_path / ".gitignore").write_text("coverage/\n*.gen.ts\n")
+    for rel in ("src", "coverage/lcov", "web/.terraform", "web/src"):
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "src" / "app.py").write_text("")
+    (tmp_path / "src" / "api.gen.ts").write_text("")
+    (tmp_path / "coverage" / "lcov" / "report.js").write_text("")
+    (tmp_path / "web" / ".gitignore").write_text(".terraform\n")
+    (tmp_path / "web" / ".terraform" / "plugin.go").write_text("")
+    (tmp_path / "web" / "src" / "main.rb").write_text("")
+
+    listed: list[str] = []
+    original = scanner._scan_dir
+
+    def counting(path, *args, **kwargs):
+        listed.append(os.path.relpath(path, tmp_path))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "_scan_dir", counting)
+    assert scan_languages(tmp_path) == ["python", "ruby"]
+    assert sorted(listed) == [".", "src", "web", "web/src"]
+
+
+def test_scan_honors_gitignore_above_the_project(tmp_path, monkeypatch):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("coverage/\n/packages/web/gen/\n")
+    web = tmp_path / "packages" / "web"
+    for rel in ("src", "coverage", "gen", "packages/web/gen"):
+        (web / rel).mkdir(parents=True)
+    (web / "src" / "app.ts").write_text("")
+    (web / "coverage" / "lcov.js").write_text("")
+    (web / "gen" / "api.go").write_text("")
+    (web / "packages" / "web" / "gen" / "main.rb").write_text("")
+
+    listed: list[str] = []
+    original = scanner._scan_dir
+
+    def counting(path, *args, **kwargs):
+        listed.append(os.path.relpath(path, web))
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "_scan_dir", counting)
+    assert scan_languages(web) == ["ruby", "typescript"]
+    assert sorted(listed) == [".", "packages", "packages/web", "packages/web/gen", "src"]
+
+    (tmp_path / ".git").rmdir()  # outside a work tree, ignore files above the project don't apply
+    assert scan_languages(web) == ["go", "javascript", "ruby", "typescript"]
+
+
+def test_scan_cache_notices_ancestor_gitignore_edits(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("# nothing yet\n")
+    web = tmp_path / "web"
+    (web / "gen").mkdir(parents=True)
+    (web / "gen" / "out.go").write_text("")
+    (web / "app.py").write_text("")
+    _age_tree(tmp_path)
+    os.utime(tmp_path / ".gitignore", (1_600_000_000, 1_600_000_000))
+    assert scan_languages(web, use_cache=True) == ["go", "python"]
+
+    (tmp_path / ".gitignore").write_text("gen/\n")
+    _age_tree(tmp_path)
+    os.utime(tmp_path / ".gitignore", (1_600_000_000, 1_600_000_000))
+    assert scan_languages(web, use_cache=True) == ["python"]
+
+
+def test_scan_cache_notices_gitignore_edits(tmp_path):
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen" / "out.go").write_text("")
+    (tmp_path / "app.py").write_text("")
+    (tmp_path / ".gitignore").write_text("# nothing yet\n")
+    _age_tree(tmp_path)
+    os.utime(tmp_path / ".gitignore", (1_600_000_000, 1_600_000_000))
+    assert scan_languages(tmp_path, use_cache=True) == ["go", "python"]
+
+    (tmp_path / ".gitignore").write_text("gen/\n")  # edited in place: the root's mtime doesn't change
+    _age_tree(tmp_path)
+    assert scan_languages(tmp_path, use_cache=True) == ["python"]
+
+
+def test_scan_cache_does_not_stat_files_of_unchanged_directories(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("x = 1\n")
+    _age_tree(tmp_path)
+    index = ProjectIndex(tmp_path)
+    assert index.language_stats(3, use_cache=True)["python"] == (1, 6)
+
+    (tmp_path / "src" / "app.py").write_text("x = 1\n" * 10)  # the directory's mtime doesn't change
+    _age_tree(tmp_path)
+    stated: list[str] = []
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stated.append(os.fspath(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+    assert ProjectIndex(tmp_path).language_stats(3, use_cache=True)["python"] == (1, 6)  # byte total lags
+    assert not any(path.endswith("app.py") for path in stated)
+    monkeypatch.undo()
+    assert ProjectIndex(tmp_path).language_stats(3)["python"] == (1, 60)
@@ -0,0 +1,40 @@
+"""Tests for token estimation."""
+
+import pytest
+
+from dotruler import tokens
+from dotruler.tokens import count_tokens, set_tokenizer, tokenizer_name, truncate_tokens
+
+
+def test_heuristic_estimates():
+    assert count_tokens("") == 0
+    assert count_tokens("Use functional components") == 3
+    assert count_tokens("- **build:** `npm run build`") == 12
+    assert count_tokens("internationalization") == 2
+    assert count_tokens("a\n\nb\n") == 2
+
+
+def test_lines_are_counted_once(monkeypatch):
+    calls = []
+
+    def counting(line):
+        calls.append(line)
+        return 1
+
+    monkeypatch.setattr(tokens, "_count_line", tokens.lru_cache(maxsize=None)(counting))
+    text = "\n".join(f"- Rule {i}" for i in range(100))
+    assert count_tokens(text) == 100
+    assert count_tokens(text + "\n- One more") == 101
+    assert len(calls) == 101
+
+
+def test_truncate_keeps_whole_lines():
+    text = "one two\nthree four\nfive six\n"
+    assert truncate_tokens(text, 4) == "one two\nthree four"
+    assert truncate_tokens(text, 100) == text
+
+
+def test_unknown_tokenizer():
+    with pytest.raises(ValueError, match="Unknown tokenizer"):
+        set_tokenizer("nope")
+    assert tokenizer_name() == "heuristic"
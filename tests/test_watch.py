@@ -0,0 +1,77 @@
+"""Tests for the polling config watcher."""
+
+import os
+
+from dotruler.watch import ConfigWatcher
+
+CONFIG = """\
+[project]
+name = "test"
+
+[style]
+rules = ["Be consistent"]
+
+[targets]
+enabled = ["claude-md", "cursorrules"]
+"""
+
+
+def _write_config(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_initial_regenerate_writes_all_targets(tmp_path):
+    config_path = tmp_path / ".dotruler.toml"
+    config_path.write_text(CONFIG)
+    watcher = ConfigWatcher(config_path, tmp_path)
+
+    assert watcher.regenerate() == [("written", "CLAUDE.md"), ("written", ".cursorrules")]
+    assert watcher.regenerate() == [("unchanged", "CLAUDE.md"), ("unchanged", ".cursorrules")]
+
+
+def test_change_is_debounced_and_only_affected_targets_written(tmp_path):
+    config_path = tmp_path / ".dotruler.toml"
+    _write_config(config_path, CONFIG, 1_000_000_000)
+    watcher = ConfigWatcher(config_path, tmp_path, debounce=1.0)
+    watcher.regenerate()
+
+    assert watcher.step(now=10.0) is None  # nothing changed
+
+    edited = CONFIG + '\n[targets.claude-md]\nextra_rules = ["Read first"]\n'
+    _write_config(config_path, edited, 2_000_000_000)
+    assert watcher.step(now=11.0) is None  # change seen, settling
+    _write_config(config_path, edited, 3_000_000_000)
+    assert watcher.step(now=11.5) is None  # another save restarts the debounce
+    assert watcher.step(now=12.0) is None
+
+    results = watcher.step(now=12.6)
+    assert results == [("written", "CLAUDE.md"), ("unchanged", ".cursorrules")]
+    assert "Read first" in (tmp_path / "CLAUDE.md").read_text()
+    assert watcher.step(now=20.0) is None
+
+
+def test_broken_config_keeps_watching(tmp_path):
+    config_path = tmp_path / ".dotruler.toml"
+    config_path.write_text("[project\n")
+    watcher = ConfigWatcher(config_path, tmp_path)
+
+    results = watcher.regenerate()
+    assert results[0][0] == "error"
+
+    config_path.write_text(CONFIG)
+    assert watcher.regenerate()[0] == ("written", "CLAUDE.md")
+
+
+def test_parent_config_change_is_detected(tmp_path):
+    parent = tmp_path / "base.toml"
+    _write_config(parent, CONFIG, 1_000_000_000)
+    config_path = tmp_path / ".dotruler.toml"
+    _write_config(config_path, 'extends = "base.toml"\n', 1_000_000_000)
+    watcher = ConfigWatcher(config_path, tmp_path, debounce=0.0)
+    watcher.regenerate()
+
+    _write_config(parent, CONFIG.replace("Be consistent", "Be kind"), 2_000_000_000)
+    assert watcher.step(now=1.0) is None
+    assert watcher.step(now=2.0) == [("written", "CLAUDE.md"), ("written", ".cursorrules")]
+    assert "Be kind" in (tmp_path / "CLAUDE.md").read_text()